@@ -10,35 +10,88 @@
 
 import subprocess
 import sys
+import argparse
+import signal
+import os
 import importlib
+import functools
+import glob
+import importlib.util
 import json
-import asyncio
 import re
 import threading
 import time
-import tkinter as tk
-from tkinter import messagebox
+import datetime
+import platform
+import uuid
 from enum import Enum
+from collections import namedtuple, deque
+
+DEPENDENCIES = [
+    ("python-osc==1.9.3", "pythonosc"),
+    ("psutil==7.2.2", "psutil"),
+    ("requests==2.32.5", "requests"),
+]
+
+# Media info comes from the Windows media session API, other systems run without it
+if sys.platform == "win32":
+    DEPENDENCIES.append(("winrt-Windows.Media.Control==3.2.1", "winrt"))
+
+# Written once every dependency is present, so later starts skip the checks entirely.
+# Delete it (or run with --check-deps) to check again.
+DEPS_MARKER = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".osc_deps_ok")
+
 
 def install_if_missing(package, import_name=None):
     if import_name is None:
         import_name = package.split("==")[0].replace("-", "_")
 
-    try:
-        importlib.import_module(import_name)
-    except ImportError:
+    if importlib.util.find_spec(import_name) is None:
         print(f"Installing {package}...")
         subprocess.check_call([sys.executable, "-m", "pip", "install", package])
 
-install_if_missing("python-osc==1.9.3", "pythonosc")
-install_if_missing("psutil==7.2.2", "psutil")
-install_if_missing("winrt-Windows.Media.Control==3.2.1", "winrt")
-install_if_missing("requests==2.32.5", "requests")
 
-import psutil
-from pythonosc.udp_client import SimpleUDPClient
-import winrt.windows.media.control as wmc
-import requests
+def ensure_dependencies(force=False):
+    stamp = json.dumps({"python": sys.executable, "packages": [package for package, _ in DEPENDENCIES]})
+
+    if not force:
+        try:
+            with open(DEPS_MARKER, encoding="utf-8") as f:
+                if f.read() == stamp:
+                    return
+        except OSError:
+            pass
+
+    for package, import_name in DEPENDENCIES:
+        install_if_missing(package, import_name)
+
+    try:
+        with open(DEPS_MARKER, "w", encoding="utf-8") as f:
+            f.write(stamp)
+    except OSError:
+        pass
+
+
+class LazyModule:
+    # Stands in for a module and imports it on first attribute access, so heavy
+    # packages load when their source is first used instead of before the GUI opens.
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+
+psutil = LazyModule("psutil")
+udp_client = LazyModule("pythonosc.udp_client")
+wmc = LazyModule("winrt.windows.media.control")
+requests = LazyModule("requests")
+# Only the media monitor thread needs asyncio, which is one of the slower stdlib imports
+asyncio = LazyModule("asyncio")
 
 # ═════════════════════════════════════════════════════════════════════════════════════════════════════════════════════#
 # CONFIGURATION & GLOBAL VARIABLES
@@ -56,23 +109,17 @@ print("Made By Boots")
 OSC_IP = "127.0.0.1"
 OSC_PORT = 9000
 
-INTERFACE = "Ethernet"
+INTERFACE = "auto"
 
 SWITCH_INTERVAL = 30
 
 LHM_REST_API = "http://localhost:8085/data.json"
 
 client = None
-running = False
 
 page1_line1_text = "-enter text-"
 page2_line1_text = "-enter text-"
 
-cpu_wattage = "error"
-cpu_temp = "error"
-gpu_wattage = "error"
-gpu_temp = "error"
-
 cpu_manufacturer = CPUManufacturer.UNKNOWN
 
 # ═════════════════════════════════════════════════════════════════════════════════════════════════════════════════════#
@@ -86,6 +133,25 @@ def _clean_name(name: str):
     return name
 
 
+def _fallback_cpu_name():
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as f:
+            for line in f:
+                if line.lower().startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor()
+
+
+def _cpu_manufacturer(cpu_name):
+    if "intel" in cpu_name.lower():
+        return CPUManufacturer.INTEL
+    elif "amd" in cpu_name.lower():
+        return CPUManufacturer.AMD
+    return CPUManufacturer.UNKNOWN
+
+
 def detect_cpu():
     global cpu_manufacturer
 
@@ -96,20 +162,15 @@ def detect_cpu():
             stderr=subprocess.DEVNULL,
             timeout=5
         ).strip()
+    except (subprocess.CalledProcessError, UnicodeDecodeError, subprocess.TimeoutExpired, OSError):
+        cpu_name = _fallback_cpu_name()
 
-        clean_cpu_name = _clean_name(cpu_name)
-
-        if "intel" in cpu_name.lower():
-            cpu_manufacturer = CPUManufacturer.INTEL
-        elif "amd" in cpu_name.lower():
-            cpu_manufacturer = CPUManufacturer.AMD
-        else:
-            cpu_manufacturer = CPUManufacturer.UNKNOWN
-
-        return clean_cpu_name
-    except (subprocess.CalledProcessError, UnicodeDecodeError, subprocess.TimeoutExpired):
+    if not cpu_name:
         return "CPU Unknown"
 
+    cpu_manufacturer = _cpu_manufacturer(cpu_name)
+    return _clean_name(cpu_name)
+
 
 def detect_gpu():
     try:
@@ -119,169 +180,518 @@ def detect_gpu():
             stderr=subprocess.DEVNULL,
             timeout=5
         ).strip()
-        return _clean_name(gpu_name)
-    except (subprocess.CalledProcessError, UnicodeDecodeError, subprocess.TimeoutExpired):
+        return _clean_name(gpu_name) or "GPU Unknown"
+    except (subprocess.CalledProcessError, UnicodeDecodeError, subprocess.TimeoutExpired, OSError):
         return "GPU Unknown"
 
 
-def get_lhm_data():
-    try:
-        response = requests.get(LHM_REST_API, timeout=5)
-        if response.status_code == 200:
-            return response.json()
-    except (requests.ConnectionError, requests.Timeout, json.JSONDecodeError):
-        pass
-    return None
+# Detected names are saved per machine so Start/Restart doesn't run PowerShell again.
+# Failed detections are never saved. A cache hit older than HARDWARE_RECHECK_AGE is
+# checked again in the background, at most once per run.
+HARDWARE_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".osc_hardware.json")
+HARDWARE_RECHECK_AGE = 7 * 24 * 3600
+UNKNOWN_HARDWARE = ("CPU Unknown", "GPU Unknown")
+hardware_rechecked = False
 
 
-def parse_lhm_data(data):
-    cpu_temp_val = 0
-    cpu_power_val = 0
-    gpu_temp_val = 0
-    gpu_power_val = 0
+def machine_fingerprint():
+    return "|".join([
+        platform.node(), platform.system(), platform.release(),
+        platform.machine(), platform.processor(), f"{uuid.getnode():x}",
+    ])
 
-    if not data or "Children" not in data:
-        return cpu_temp_val, cpu_power_val, gpu_temp_val, gpu_power_val
+
+def load_cached_hardware():
+    # Returns ((cpu, gpu), time of the detection) or None
+    global cpu_manufacturer
 
     try:
-        for top_level in data.get("Children", []):
-            for hardware in top_level.get("Children", []):
-                hardware_text = hardware.get("Text", "").lower()
-
-                if "intel" in hardware_text:
-                    for category in hardware.get("Children", []):
-                        category_text = category.get("Text", "").lower()
-
-                        if "temperature" in category_text:
-                            for sensor in category.get("Children", []):
-                                sensor_text = sensor.get("Text", "").lower()
-                                if "cpu package" in sensor_text:
-                                    try:
-                                        sensor_value = sensor.get("Value", 0)
-                                        numeric_str = re.sub(r'[^\d.-]', '', str(sensor_value))
-                                        cpu_temp_val = int(float(numeric_str))
-                                    except (ValueError, TypeError):
-                                        pass
-
-                        if "power" in category_text:
-                            for sensor in category.get("Children", []):
-                                sensor_text = sensor.get("Text", "").lower()
-                                if "cpu package" in sensor_text:
-                                    try:
-                                        sensor_value = sensor.get("Value", 0)
-                                        numeric_str = re.sub(r'[^\d.-]', '', str(sensor_value))
-                                        cpu_power_val = int(float(numeric_str))
-                                    except (ValueError, TypeError):
-                                        pass
-
-                elif "amd radeon" in hardware_text:
-                    for category in hardware.get("Children", []):
-                        category_text = category.get("Text", "").lower()
-
-                        if "temperature" in category_text:
-                            for sensor in category.get("Children", []):
-                                sensor_text = sensor.get("Text", "").lower()
-                                if "gpu core" in sensor_text and "distance" not in sensor_text:
-                                    try:
-                                        sensor_value = sensor.get("Value", 0)
-                                        numeric_str = re.sub(r'[^\d.-]', '', str(sensor_value))
-                                        gpu_temp_val = int(float(numeric_str))
-                                    except (ValueError, TypeError):
-                                        pass
-
-                        if "power" in category_text:
-                            for sensor in category.get("Children", []):
-                                sensor_text = sensor.get("Text", "").lower()
-                                if "gpu package" in sensor_text:
-                                    try:
-                                        sensor_value = sensor.get("Value", 0)
-                                        numeric_str = re.sub(r'[^\d.-]', '', str(sensor_value))
-                                        gpu_power_val = int(float(numeric_str))
-                                    except (ValueError, TypeError):
-                                        pass
-
-    except (KeyError, TypeError, AttributeError, ValueError):
+        with open(HARDWARE_CACHE, encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("fingerprint") != machine_fingerprint():
+            return None
+        cpu_manufacturer = CPUManufacturer(cached["manufacturer"])
+        return (cached["cpu"], cached["gpu"]), float(cached.get("checked_at", 0))
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+def save_cached_hardware(names):
+    try:
+        with open(HARDWARE_CACHE, "w", encoding="utf-8") as f:
+            json.dump({
+                "fingerprint": machine_fingerprint(),
+                "manufacturer": cpu_manufacturer.value,
+                "cpu": names[0],
+                "gpu": names[1],
+                "checked_at": time.time(),
+            }, f)
+    except OSError:
         pass
 
-    return cpu_temp_val, cpu_power_val, gpu_temp_val, gpu_power_val
 
+def query_hardware():
+    # Runs both PowerShell queries at the same time
+    results = {}
+    workers = [
+        threading.Thread(target=lambda: results.__setitem__("cpu", detect_cpu()), daemon=True),
+        threading.Thread(target=lambda: results.__setitem__("gpu", detect_gpu()), daemon=True),
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    return results.get("cpu", UNKNOWN_HARDWARE[0]), results.get("gpu", UNKNOWN_HARDWARE[1])
+
+
+def detect_hardware():
+    # Saves the names unless a query failed, unchanged names too so the check time moves on
+    names = query_hardware()
+    if not any(name in UNKNOWN_HARDWARE for name in names):
+        save_cached_hardware(names)
+    return names
+
+
+def detect_hardware_async(on_done):
+    # Cache hits return straight away. A stale hit is checked again in the background so
+    # a swapped GPU shows up once detection finishes. Without a cache detection runs there.
+    global hardware_rechecked
+
+    cached, checked_at = load_cached_hardware() or (None, 0.0)
+    if cached is not None:
+        on_done(cached)
+        if hardware_rechecked or time.time() - checked_at < HARDWARE_RECHECK_AGE:
+            return
+        hardware_rechecked = True
+
+    def detect():
+        names = detect_hardware()
+        if cached is None or (names != cached and not any(name in UNKNOWN_HARDWARE for name in names)):
+            on_done(names)
+
+    threading.Thread(target=detect, name="hardware-detect", daemon=True).start()
+
+
+class LHMClient:
+    # One keep-alive session for the whole run. Short timeouts keep a missing LHM
+    # from stalling the loop, and while it is down requests back off exponentially.
+
+    CONNECT_TIMEOUT = 0.5
+    READ_TIMEOUT = 2.0
+    BACKOFF_START = 1.0
+    BACKOFF_MAX = 60.0
+
+    def __init__(self, url):
+        self.url = url
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=2, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.etag = None
+        self.last_data = None
+        self.last_paths = None
+        self.backoff = 0.0
+        self.retry_at = 0.0
+
+    def fetch(self, paths=None):
+        # With node positions only those nodes are streamed out of the response (see
+        # read_lhm_nodes), without them the whole tree is decoded
+        if time.monotonic() < self.retry_at:
+            return None
+
+        stream = bool(paths) and LHM_STREAM_PARSE
+        paths = paths if stream else None
+        headers = {"If-None-Match": self.etag} if self.etag and paths == self.last_paths else None
+        try:
+            with self.session.get(self.url, headers=headers, stream=stream,
+                                  timeout=(self.CONNECT_TIMEOUT, self.READ_TIMEOUT)) as response:
+                if response.status_code == 304 and self.last_data is not None:
+                    self._succeeded()
+                    return self.last_data
+                if response.status_code == 200:
+                    if stream:
+                        chunks = response.iter_content(LHM_STREAM_CHUNK)
+                        self.last_data = read_lhm_nodes(chunks, paths)
+                        # Drain the rest so the connection goes back to the pool
+                        for _ in chunks:
+                            pass
+                    else:
+                        self.last_data = response.json()
+                    self.last_paths = paths
+                    self.etag = response.headers.get("ETag")
+                    self._succeeded()
+                    return self.last_data
+        except (requests.RequestException, ValueError):
+            pass
+
+        self._failed()
+        return None
+
+    def _succeeded(self):
+        self.backoff = 0.0
+        self.retry_at = 0.0
+
+    def _failed(self):
+        self.backoff = min(self.backoff * 2, self.BACKOFF_MAX) if self.backoff else self.BACKOFF_START
+        self.retry_at = time.monotonic() + self.backoff
+
+    def close(self):
+        self.session.close()
+
+
+lhm_client = None
 
-def get_gpu_load_from_lhm(data):
-    if not data or "Children" not in data:
-        return 0
 
+def get_lhm_data(paths=None):
+    if lhm_client is None:
+        return None
+    return lhm_client.fetch(paths)
+
+
+_NON_NUMERIC = re.compile(r"[^\d.-]")
+
+
+def _sensor_number(value):
+    # LHM values look like "45.0 °C", so the number is usually everything before the space
+    text = str(value)
     try:
-        for top_level in data.get("Children", []):
-            for hardware in top_level.get("Children", []):
-                hardware_text = hardware.get("Text", "").lower()
-
-                if "amd radeon" in hardware_text:
-                    for category in hardware.get("Children", []):
-                        category_text = category.get("Text", "").lower()
-
-                        if "load" in category_text:
-                            for sensor in category.get("Children", []):
-                                sensor_text = sensor.get("Text", "").lower()
-                                if "gpu core" in sensor_text:
-                                    try:
-                                        sensor_value = sensor.get("Value", 0)
-                                        numeric_str = re.sub(r'[^\d.-]', '', str(sensor_value))
-                                        return int(float(numeric_str))
-                                    except (ValueError, TypeError):
-                                        pass
-    except (KeyError, TypeError, AttributeError, ValueError):
+        return int(float(text.partition(" ")[0]))
+    except (ValueError, OverflowError):
         pass
+    try:
+        return int(float(_NON_NUMERIC.sub("", text)))
+    except (ValueError, OverflowError):
+        return None
 
-    return 0
 
+def index_lhm_sensors(data):
+    # Flattens the LHM tree in one walk into one entry per hardware device:
+    # ((top, hardware) position, name, HardwareId, {(category, sensor): (category, sensor) position})
+    index = []
 
-def get_cpu_load_from_lhm(data):
     if not data or "Children" not in data:
-        return 0
+        return index
 
     try:
-        for top_level in data.get("Children", []):
-            for hardware in top_level.get("Children", []):
-                hardware_text = hardware.get("Text", "").lower()
-
-                if "intel" in hardware_text:
-                    for category in hardware.get("Children", []):
-                        category_text = category.get("Text", "").lower()
-
-                        if "load" in category_text:
-                            for sensor in category.get("Children", []):
-                                sensor_text = sensor.get("Text", "").lower()
-                                if "cpu total" in sensor_text:
-                                    try:
-                                        sensor_value = sensor.get("Value", 0)
-                                        numeric_str = re.sub(r'[^\d.-]', '', str(sensor_value))
-                                        return int(float(numeric_str))
-                                    except (ValueError, TypeError):
-                                        pass
-
-                elif "amd" in hardware_text and "radeon" not in hardware_text:
-                    for category in hardware.get("Children", []):
-                        category_text = category.get("Text", "").lower()
-
-                        if "load" in category_text:
-                            for sensor in category.get("Children", []):
-                                sensor_text = sensor.get("Text", "").lower()
-                                if "cpu total" in sensor_text:
-                                    try:
-                                        sensor_value = sensor.get("Value", 0)
-                                        numeric_str = re.sub(r'[^\d.-]', '', str(sensor_value))
-                                        return int(float(numeric_str))
-                                    except (ValueError, TypeError):
-                                        pass
-    except (KeyError, TypeError, AttributeError, ValueError):
+        for i, top_level in enumerate(data.get("Children", [])):
+            for j, hardware in enumerate(top_level.get("Children", [])):
+                sensors = {}
+                for k, category in enumerate(hardware.get("Children", [])):
+                    category_text = category.get("Text", "").lower()
+                    for m, sensor in enumerate(category.get("Children", [])):
+                        sensors.setdefault((category_text, sensor.get("Text", "").lower()), (k, m))
+                index.append(((i, j), hardware.get("Text", ""), hardware.get("HardwareId", ""), sensors))
+    except (KeyError, TypeError, AttributeError):
         pass
 
-    return 0
+    return index
+
+
+# Per vendor: (vendor, kind, LHM HardwareId prefix, hardware name pattern, {stat: [(category, sensor), ...]}).
+# Names are LHM's own (lower case), candidates are tried in order. Vendors are checked top to
+# bottom, so Intel GPUs must come before Intel CPUs and Radeon before AMD CPUs.
+VENDOR_RULES = [
+    ("nvidia", "gpu", "/gpu-nvidia", r"nvidia|geforce|quadro|\brtx\b", {
+        "load": [("load", "gpu core")],
+        "temp": [("temperatures", "gpu core")],
+        "power": [("powers", "gpu package"), ("powers", "gpu power")],
+        "vram_used": [("data", "gpu memory used")],
+        "vram_total": [("data", "gpu memory total")],
+    }),
+    ("amd", "gpu", "/gpu-amd", r"radeon", {
+        "load": [("load", "gpu core")],
+        "temp": [("temperatures", "gpu core")],
+        "power": [("powers", "gpu package"), ("powers", "gpu core")],
+        "vram_used": [("data", "gpu memory used"), ("data", "d3d dedicated memory used")],
+        "vram_total": [("data", "gpu memory total"), ("data", "d3d dedicated memory total")],
+    }),
+    ("intel", "gpu", "/gpu-intel", r"intel.*\b(arc|iris|uhd|graphics)\b", {
+        "load": [("load", "gpu core"), ("load", "d3d 3d")],
+        "temp": [("temperatures", "gpu core")],
+        "power": [("powers", "gpu package"), ("powers", "gpu power")],
+        "vram_used": [("data", "d3d dedicated memory used"), ("data", "gpu memory used")],
+        "vram_total": [("data", "d3d dedicated memory total"), ("data", "gpu memory total")],
+    }),
+    ("intel", "cpu", "/intelcpu", r"intel", {
+        "load": [("load", "cpu total")],
+        "temp": [("temperatures", "cpu package"), ("temperatures", "core average"), ("temperatures", "core max")],
+        "power": [("powers", "cpu package"), ("powers", "package")],
+    }),
+    ("amd", "cpu", "/amdcpu", r"ryzen|threadripper|epyc|athlon|\bamd\b", {
+        "load": [("load", "cpu total")],
+        "temp": [("temperatures", "core (tctl/tdie)"), ("temperatures", "core (tctl)"),
+                 ("temperatures", "cpu package"), ("temperatures", "tctl/tdie")],
+        "power": [("powers", "package"), ("powers", "cpu package")],
+    }),
+]
+
+_VENDOR_RULES = [
+    (vendor, kind, id_prefix, re.compile(pattern, re.IGNORECASE), stats)
+    for vendor, kind, id_prefix, pattern, stats in VENDOR_RULES
+]
+
+
+def match_vendor(name, hardware_id=""):
+    for vendor, kind, id_prefix, pattern, stats in _VENDOR_RULES:
+        if hardware_id.startswith(id_prefix) if hardware_id else pattern.search(name):
+            return vendor, kind, stats
+    return None
+
+
+DeviceReading = namedtuple("DeviceReading", "kind name load temp power vram_used vram_total")
+DEVICE_STATS = DeviceReading._fields[2:]
+NO_DEVICE = DeviceReading("", "", 0, 0, 0, 0, 0)
+
+
+def match_lhm_sensors(index):
+    # Picks the sensors for every CPU/GPU device, returns [(kind, name, position, {stat: (key, position)})]
+    devices = []
+
+    for position, name, hardware_id, sensors in index:
+        matched = match_vendor(name, hardware_id)
+        if matched is None:
+            continue
+        _, kind, rules = matched
+
+        stats = {}
+        for stat, candidates in rules.items():
+            for key in candidates:
+                if key in sensors:
+                    stats[stat] = (key, sensors[key])
+                    break
+
+        # Name-only matches can hit things like "INTEL SSD...", those have none of the sensors
+        if stats:
+            devices.append((kind, name, position, stats))
+
+    return devices
+
+
+# Polls from cached sensor positions stream only those nodes out of data.json instead of
+# decoding the whole tree. Uses far less memory on big trees, and more CPU (see
+# benchmarks/bench_lhm_parse.py). Rescans always decode the whole tree.
+LHM_STREAM_PARSE = True
+LHM_STREAM_CHUNK = 16 * 1024
+
+_JSON_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_JSON_SCALAR = re.compile(rb"[^\s,:\[\]{}\"]+")
+_JSON_WS = re.compile(rb"[ \t\n\r]*")
+# Plain text and whole strings up to the next bracket outside a string, in one match
+_JSON_TO_BRACKET = re.compile(rb'[^"\[\]{}]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"\[\]{}]*)*([\[\]{}])', re.DOTALL)
+_NODE_FIELDS = (b'"Text"', b'"Value"')
+
+
+class LHMStreamReader:
+    # Pulls the Text/Value of the nodes at the given positions out of the byte stream as
+    # it arrives. Every other subtree is stepped over without building it, and reading
+    # stops after the last of those nodes. The result is a sparse tree that indexes like
+    # the full one, with each Children list replaced by a {position: node} dict.
+
+    def __init__(self, chunks, paths):
+        self.chunks = iter(chunks)
+        self.buffer = b""
+        self.pos = 0
+        self.paths = paths
+        self.prefixes = {path[:n] for path in paths for n in range(len(path) + 1)}
+        self.last = max(self.prefixes)
+        self.finished = False
+
+    def _fill(self):
+        for chunk in self.chunks:
+            if chunk:
+                self.buffer = self.buffer[self.pos:] + chunk
+                self.pos = 0
+                return
+        raise ValueError("LHM data ended early")
+
+    def _match(self, pattern):
+        # A match that runs to the end of the buffer could continue in the next chunk
+        while True:
+            match = pattern.match(self.buffer, self.pos)
+            if match and match.end() < len(self.buffer):
+                return match
+            self._fill()
+
+    def _next(self):
+        self.pos = self._match(_JSON_WS).end()
+        char = self.buffer[self.pos:self.pos + 1]
+        self.pos += 1
+        return char
+
+    def _peek(self):
+        self.pos = self._match(_JSON_WS).end()
+        return self.buffer[self.pos:self.pos + 1]
+
+    def _expect(self, char):
+        if self._next() != char:
+            raise ValueError(f"Expected {char!r} in LHM data")
+
+    def _token(self):
+        pattern = _JSON_STRING if self._peek() == b'"' else _JSON_SCALAR
+        match = self._match(pattern)
+        self.pos = match.end()
+        return match.group()
+
+    def _skip(self):
+        if self._peek() not in (b"{", b"["):
+            self._token()
+            return
+        depth = 0
+        while True:
+            match = _JSON_TO_BRACKET.match(self.buffer, self.pos)
+            if match is None:
+                self._fill()
+                continue
+            self.pos = match.end()
+            depth += 1 if match.group(1) in b"[{" else -1
+            if depth == 0:
+                return
+
+    def _node(self, path):
+        node = {"Children": {}}
+        keep_fields = path in self.paths
+        self._expect(b"{")
+        if self._peek() == b"}":
+            self.pos += 1
+            return node
+
+        while not self.finished:
+            key = self._token()
+            self._expect(b":")
+            if key == b'"Children"':
+                self._children(path, node["Children"])
+            elif keep_fields and key in _NODE_FIELDS:
+                node[key[1:-1].decode()] = json.loads(self._token())
+            else:
+                self._skip()
+            if self.finished or self._next() == b"}":
+                break
+
+        if path == self.last:
+            self.finished = True
+        return node
+
+    def _children(self, path, children):
+        self._expect(b"[")
+        if self._peek() == b"]":
+            self.pos += 1
+            return
+
+        position = 0
+        while not self.finished:
+            child = path + (position,)
+            if child in self.prefixes:
+                children[position] = self._node(child)
+            else:
+                self._skip()
+            if self.finished or self._next() == b"]":
+                return
+            position += 1
+
+    def read(self):
+        self._fill()
+        if self.buffer.startswith(b"\xef\xbb\xbf"):
+            self.pos = 3
+        return self._node(())
+
+
+def read_lhm_nodes(chunks, paths):
+    return LHMStreamReader(chunks, paths).read()
+
+
+class LHMSensorResolver:
+    # Resolves sensor positions once, then only reads those nodes on later polls.
+    # A full rescan happens when a cached node no longer has the expected name,
+    # and every RESCAN_EVERY polls so hardware that appears later gets picked up.
+
+    RESCAN_EVERY = 100
+
+    def __init__(self):
+        self.devices = None
+        self.polls = 0
+
+    def reset(self):
+        self.devices = None
+        self.polls = 0
+
+    def paths(self):
+        # Node positions the next poll reads, None when it needs the whole tree
+        if self.devices is None or self.polls + 1 >= self.RESCAN_EVERY:
+            return None
+        paths = set()
+        for _, _, _, (i, j), stats in self.devices:
+            paths.add((i, j))
+            paths.update((i, j, k, m) for _, _, (k, m) in stats)
+        return paths
+
+    def read(self, data):
+        if not data or "Children" not in data:
+            return ()
+
+        self.polls += 1
+        if self.devices is not None and self.polls < self.RESCAN_EVERY:
+            readings = self._read_devices(data)
+            if readings is not None:
+                return readings
+            if isinstance(data["Children"], dict):
+                # Streamed nodes that moved can't be rescanned, keep the last readings
+                # and fetch the whole tree next time
+                self.devices = None
+                return None
+
+        # Per device: (kind, LHM name, shown name, position, [(stat slot, sensor name, position)])
+        self.devices = [
+            (kind, name, _clean_name(name), position,
+             [(DEVICE_STATS.index(stat), sensor_text, sensor_position)
+              for stat, ((_, sensor_text), sensor_position) in stats.items()])
+            for kind, name, position, stats in match_lhm_sensors(index_lhm_sensors(data))
+        ]
+        self.polls = 0
+        return self._read_devices(data) or ()
+
+    def _read_devices(self, data):
+        readings = []
+
+        for kind, name, shown_name, (i, j), stats in self.devices:
+            values = [0] * len(DEVICE_STATS)
+            try:
+                hardware = data["Children"][i]["Children"][j]
+                if hardware.get("Text", "") != name:
+                    return None
+                categories = hardware["Children"]
+                for slot, sensor_text, (k, m) in stats:
+                    sensor = categories[k]["Children"][m]
+                    if sensor.get("Text", "").lower() != sensor_text:
+                        return None
+                    values[slot] = _sensor_number(sensor.get("Value", 0)) or 0
+            except (KeyError, IndexError, TypeError, AttributeError):
+                return None
+
+            readings.append(DeviceReading(kind, shown_name, *values))
+
+        return tuple(readings)
+
+
+lhm_resolver = LHMSensorResolver()
+
+
+def parse_lhm_data(data):
+    return lhm_resolver.read(data)
+
+
+def primary_devices(devices):
+    # The first CPU and the GPU with the most VRAM (the dGPU on iGPU + dGPU rigs)
+    cpus = [d for d in devices if d.kind == "cpu"]
+    gpus = [d for d in devices if d.kind == "gpu"]
+    cpu = cpus[0] if cpus else NO_DEVICE
+    gpu = max(gpus, key=lambda d: d.vram_total) if gpus else NO_DEVICE
+    return cpu, gpu
 
 
 def diagnose_lhm():
     try:
-        response = requests.get(LHM_REST_API, timeout=5)
+        response = lhm_client.session.get(LHM_REST_API, timeout=(LHMClient.CONNECT_TIMEOUT, LHMClient.READ_TIMEOUT))
         if response.status_code == 200:
             print("[DIAGNOSTIC] ✓ REST API Connection: SUCCESS")
             data = response.json()
@@ -313,201 +723,1531 @@ def fmt(bps):
     return f"{bps / 1024:.1f} KB/s"
 
 
-def get_network_usage(prev, prev_time):
-    now = time.time()
-    try:
-        cur = psutil.net_io_counters(pernic=True)[INTERFACE]
-        elapsed = now - prev_time
+# EWMA weight of the newest sample, lower is smoother
+NETWORK_SMOOTHING = 0.3
+# Auto mode only moves to another interface once it is this much busier than the current one
+NETWORK_SWITCH_RATIO = 1.5
+# How often auto mode re-reads which interfaces are up
+NETWORK_STATUS_REFRESH = 10.0
+
+
+def parse_interfaces(text):
+    # "auto" picks the busiest interface, otherwise a comma separated list is summed
+    names = [name.strip() for name in text.split(",") if name.strip()]
+    if not names or [name.lower() for name in names] == ["auto"]:
+        return None
+    return names
+
+
+def _is_loopback(nic):
+    # "lo" on Linux, "Loopback Pseudo-Interface 1" on Windows (not "Local Area Connection")
+    name = nic.lower()
+    return name == "lo" or name.startswith("loopback")
+
+
+class NetworkMonitor:
+    def __init__(self, interfaces=None, smoothing=NETWORK_SMOOTHING):
+        self.interfaces = interfaces
+        self.smoothing = smoothing
+        self.prev = psutil.net_io_counters(pernic=True)
+        self.prev_time = time.monotonic()
+        self.smoothed = {}
+        self.current = None
+        self.up = None
+        self.up_checked_at = 0.0
+
+    def sample(self):
+        # psutil already undoes 32-bit counter wraps (nowrap=True), a counter that still
+        # goes backwards means the NIC was reset, so that sample counts as 0
+        now = time.monotonic()
+        counters = psutil.net_io_counters(pernic=True)
+        elapsed = now - self.prev_time
+
+        rates = {}
         if elapsed > 0:
-            up = (cur.bytes_sent - prev.bytes_sent) / elapsed
-            down = (cur.bytes_recv - prev.bytes_recv) / elapsed
+            for nic, cur in counters.items():
+                prev = self.prev.get(nic)
+                if prev is None:
+                    continue
+                up = max(cur.bytes_sent - prev.bytes_sent, 0) / elapsed
+                down = max(cur.bytes_recv - prev.bytes_recv, 0) / elapsed
+                rates[nic] = (up, down)
+
+                s_up, s_down = self.smoothed.get(nic, (up, down))
+                self.smoothed[nic] = (
+                    s_up + self.smoothing * (up - s_up),
+                    s_down + self.smoothing * (down - s_down),
+                )
+
+        self.prev = counters
+        self.prev_time = now
+
+        if self.interfaces is not None:
+            chosen = [nic for nic in self.interfaces if nic in rates]
+            label = ", ".join(self.interfaces)
         else:
-            up, down = 0, 0
-        return cur, up, down, now
-    except (KeyError, ZeroDivisionError):
-        return prev, 0, 0, now
+            self.current = self._busiest()
+            chosen = [self.current] if self.current in rates else []
+            label = self.current or "auto"
+
+        up = sum(rates[nic][0] for nic in chosen)
+        down = sum(rates[nic][1] for nic in chosen)
+        up_avg = sum(self.smoothed[nic][0] for nic in chosen)
+        down_avg = sum(self.smoothed[nic][1] for nic in chosen)
+        return up, down, up_avg, down_avg, label
+
+    def _up_interfaces(self):
+        now = time.monotonic()
+        if now >= self.up_checked_at:
+            self.up_checked_at = now + NETWORK_STATUS_REFRESH
+            try:
+                self.up = {nic for nic, stats in psutil.net_if_stats().items() if stats.isup}
+            except OSError:
+                self.up = None
+        return self.up
+
+    def _busiest(self):
+        # Interfaces that are up win over ones that are down, even when everything is idle
+        totals = {nic: up + down for nic, (up, down) in self.smoothed.items() if not _is_loopback(nic)}
+        up_nics = self._up_interfaces()
+        if up_nics:
+            totals = {nic: total for nic, total in totals.items() if nic in up_nics} or totals
+        if not totals:
+            return self.current
+
+        busiest = max(totals, key=totals.get)
+        current_total = totals.get(self.current)
+        if current_total is not None and totals[busiest] < current_total * NETWORK_SWITCH_RATIO:
+            return self.current
+        return busiest
+
+
+# ═════════════════════════════════════════════════════════════════════════════════════════════════════════════════════#
+# STEAMVR FRAME TIMING
+# ═════════════════════════════════════════════════════════════════════════════════════════════════════════════════════#
+
+# Needs the optional openvr package, the SteamVR page only shows while SteamVR is running
+STEAMVR_STATS = True
+STEAMVR_SAMPLE_INTERVAL = 1.0
+STEAMVR_RETRY_INTERVAL = 30.0
+# Frames read per sample (one batched call, 90 Hz headset at a 1s interval) and frames kept for the percentiles
+STEAMVR_FRAME_BATCH = 90
+STEAMVR_FRAME_WINDOW = 450
+
+# Compositor_FrameTiming.m_nReprojectionFlags bits meaning the frame was reprojected (CPU / GPU bound)
+REPROJECTION_REASON_MASK = 0x01 | 0x02
+
+
+class OpenVRCompositor:
+    # The one OpenVR handle for the run. Opening it fails if SteamVR isn't running.
+
+    def __init__(self):
+        import ctypes
+
+        self.openvr = importlib.import_module("openvr")
+        self.system = self.openvr.init(self.openvr.VRApplication_Background)
+        self.compositor = self.openvr.VRCompositor()
+        self.event = self.openvr.VREvent_t()
+        # Only the first entry's size has to be set, OpenVR infers the rest from it
+        self.timings = (self.openvr.Compositor_FrameTiming * STEAMVR_FRAME_BATCH)()
+        self.timings[0].m_nSize = ctypes.sizeof(self.openvr.Compositor_FrameTiming)
+
+    def quit_requested(self):
+        while self.system.pollNextEvent(self.event):
+            if self.event.eventType == self.openvr.VREvent_Quit:
+                return True
+        return False
+
+    def frame_timings(self):
+        # The most recent frames, oldest first, in one call
+        filled, timings = self.compositor.getFrameTimings(self.timings)
+        return timings[:filled]
+
+    def close(self):
+        self.openvr.shutdown()
+
+
+class SteamVRFrameStats:
+    # Reads the most recent frames in one batch and keeps the ones it hasn't seen yet.
+    # The compositor factory can be swapped for a fake one. SteamVR not running is the
+    # normal case, so that is logged once and not again until a connection has worked.
+    # When no new frames arrive (SteamVR stalled or went away without saying so) the
+    # kept frames age out, so the page doesn't stay up with a frozen frame rate.
+
+    def __init__(self, compositor_factory=OpenVRCompositor):
+        self.compositor_factory = compositor_factory
+        self.compositor = None
+        self.retry_at = 0.0
+        self.reported_unavailable = False
+        self.last_frame = None
+        # time.monotonic() minus the compositor's system time, taken from the newest frame
+        self.clock_offset = 0.0
+        self.frames = deque(maxlen=STEAMVR_FRAME_WINDOW)
+
+    def _open(self):
+        if time.monotonic() < self.retry_at:
+            return False
+        try:
+            self.compositor = self.compositor_factory()
+        except ImportError:
+            print("SteamVR frame timing needs the openvr package (pip install openvr)")
+            self.retry_at = float("inf")
+            return False
+        except Exception as e:
+            if not self.reported_unavailable:
+                print(f"SteamVR not available: {e}")
+                self.reported_unavailable = True
+            self.retry_at = time.monotonic() + STEAMVR_RETRY_INTERVAL
+            return False
+
+        if self.reported_unavailable:
+            print("SteamVR frame timing connected")
+            self.reported_unavailable = False
+        return True
+
+    def _read_new_frames(self):
+        timings = self.compositor.frame_timings()
+        indexes = [timing.m_nFrameIndex for timing in timings]
+        start = indexes.index(self.last_frame) + 1 if self.last_frame in indexes else 0
+        if indexes:
+            self.last_frame = indexes[-1]
+        return timings[start:]
+
+    def _drop_stale_frames(self):
+        cutoff = time.monotonic() - self.clock_offset - 2 * STEAMVR_SAMPLE_INTERVAL
+        while self.frames and self.frames[0][0] < cutoff:
+            self.frames.popleft()
+
+    def _release(self, retry_in):
+        self.close()
+        self.retry_at = time.monotonic() + retry_in
+
+    def sample(self):
+        if self.compositor is None and not self._open():
+            return ()
+
+        try:
+            if self.compositor.quit_requested():
+                print("SteamVR is shutting down, frame timing stopped")
+                self._release(STEAMVR_RETRY_INTERVAL)
+                return ()
+            new_frames = self._read_new_frames()
+        except Exception as e:
+            print(f"SteamVR frame timing lost: {e}")
+            self._release(STEAMVR_RETRY_INTERVAL)
+            return ()
+
+        for timing in new_frames:
+            reprojected = bool(timing.m_nReprojectionFlags & REPROJECTION_REASON_MASK) or timing.m_nNumFramePresents > 1
+            self.frames.append((timing.m_flSystemTimeInSeconds, timing.m_flClientFrameIntervalMs,
+                                reprojected, timing.m_nNumDroppedFrames))
+        if new_frames:
+            self.clock_offset = time.monotonic() - self.frames[-1][0]
+        else:
+            self._drop_stale_frames()
+
+        if len(self.frames) < 2:
+            return ()
+
+        span = self.frames[-1][0] - self.frames[0][0]
+        fps = (len(self.frames) - 1) / span if span > 0 else 0
+        frame_times = sorted(frame[1] for frame in self.frames)
+        p50 = frame_times[len(frame_times) // 2]
+        p99 = frame_times[min(int(len(frame_times) * 0.99), len(frame_times) - 1)]
+        reprojected = sum(1 for frame in self.frames if frame[2]) / len(self.frames)
+        dropped = sum(frame[3] for frame in self.frames)
+        return round(fps), round(p50, 1), round(p99, 1), round(reprojected * 100), dropped
+
+    def close(self):
+        if self.compositor is not None:
+            try:
+                self.compositor.close()
+            except Exception:
+                pass
+        self.compositor = None
+        self.last_frame = None
+        self.frames.clear()
+
+
+# ═════════════════════════════════════════════════════════════════════════════════════════════════════════════════════#
+# VRCHAT LOG MONITORING
+# ═════════════════════════════════════════════════════════════════════════════════════════════════════════════════════#
+
+VRCHAT_LOG_DIR = os.path.join(os.path.expanduser("~"), "AppData", "LocalLow", "VRChat", "VRChat")
+VRCHAT_LOG_GLOB = "output_log_*.txt"
+VRCHAT_LOG_INTERVAL = 2.0
+# Most bytes read per sample, a long log is caught up over a few samples instead of one big read
+VRCHAT_LOG_CHUNK = 1024 * 1024
+
+# How often to look for a newer log file, the current one is checked with a stat every sample
+VRCHAT_LOG_RESCAN = 10.0
+# How long a join/leave stays on the page
+VRCHAT_EVENT_SECONDS = 60.0
+
+_VRC_ENTERING_ROOM = re.compile(r"\[Behaviour] Entering Room: (.+)$")
+_VRC_JOINING = re.compile(r"\[Behaviour] Joining (wrld_[0-9a-f-]+):([^\s~]+)")
+_VRC_LEFT_ROOM = re.compile(r"\[Behaviour] OnLeftRoom")
+_VRC_PLAYER_JOINED = re.compile(r"\[Behaviour] OnPlayerJoined (.+?)(?: \(usr_[0-9a-f-]+\))?$")
+_VRC_PLAYER_LEFT = re.compile(r"\[Behaviour] OnPlayerLeft (.+?)(?: \(usr_[0-9a-f-]+\))?$")
+
+
+class LogTailer:
+    # Follows the newest file matching the pattern. Only bytes past the saved offset
+    # are read, a line that is still being written is kept until it is finished.
+    # The file is started over if it was replaced (inode changed) or truncated
+    # (smaller than the offset), and the folder is only listed every VRCHAT_LOG_RESCAN.
+
+    def __init__(self, directory, pattern):
+        self.directory = directory
+        self.pattern = pattern
+        self.path = None
+        self.inode = None
+        self.offset = 0
+        self.partial = b""
+        self.rescan_at = 0.0
+        self.caught_up = False
+
+    def _newest(self):
+        paths = glob.glob(os.path.join(self.directory, self.pattern))
+        return max(paths, key=os.path.getmtime) if paths else None
+
+    def _start(self, path):
+        self.path = path
+        self.inode = None
+        self.offset = 0
+        self.partial = b""
+        self.caught_up = False
+
+    def read_lines(self):
+        now = time.monotonic()
+        if self.path is None or now >= self.rescan_at:
+            self.rescan_at = now + VRCHAT_LOG_RESCAN
+            newest = self._newest()
+            if newest is not None and newest != self.path:
+                self._start(newest)
+        if self.path is None:
+            return []
+
+        stat = os.stat(self.path)
+        if self.inode is not None and (stat.st_ino != self.inode or stat.st_size < self.offset):
+            self._start(self.path)
+        self.inode = stat.st_ino
+        if stat.st_size == self.offset:
+            self.caught_up = True
+            return []
+
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read(VRCHAT_LOG_CHUNK)
+        self.offset += len(data)
+        self.caught_up = self.offset >= stat.st_size
+
+        lines = (self.partial + data).split(b"\n")
+        self.partial = lines.pop()
+        return [line.decode("utf-8", "replace").rstrip("\r") for line in lines]
+
+
+class VRChatLogMonitor:
+    # VRChat's log has no frame rate lines, so FPS comes from the SteamVR source.
+    # This tracks the world, instance and players in it from the log. Joins and
+    # leaves read while catching up on an old log are counted but not announced.
+
+    def __init__(self, tailer=None):
+        self.tailer = LogTailer(VRCHAT_LOG_DIR, VRCHAT_LOG_GLOB) if tailer is None else tailer
+        self.world = ""
+        self.world_id = ""
+        self.instance = ""
+        self.players = set()
+        self.last_event = ""
+        self.last_event_at = 0.0
+        self.announce = False
+
+    def _event(self, text):
+        if self.announce:
+            self.last_event = text
+            self.last_event_at = time.monotonic()
+
+    def handle_line(self, line):
+        if "[Behaviour]" not in line:
+            return
+
+        match = _VRC_PLAYER_JOINED.search(line)
+        if match:
+            self.players.add(match.group(1))
+            self._event(f"+ {match.group(1)}")
+            return
+        match = _VRC_PLAYER_LEFT.search(line)
+        if match:
+            self.players.discard(match.group(1))
+            self._event(f"- {match.group(1)}")
+            return
+        match = _VRC_JOINING.search(line)
+        if match:
+            self.world_id, self.instance = match.groups()
+            self.players.clear()
+            return
+        match = _VRC_ENTERING_ROOM.search(line)
+        if match:
+            self.world = match.group(1).strip()
+            return
+        if _VRC_LEFT_ROOM.search(line):
+            self.world = self.world_id = self.instance = ""
+            self.players.clear()
+
+    def sample(self):
+        self.announce = self.tailer.caught_up
+        try:
+            for line in self.tailer.read_lines():
+                self.handle_line(line)
+        except OSError:
+            return None
+
+        event = self.last_event if time.monotonic() - self.last_event_at < VRCHAT_EVENT_SECONDS else ""
+        return self.world, self.instance, len(self.players), event
 
 
 # ═════════════════════════════════════════════════════════════════════════════════════════════════════════════════════#
 # MEDIA MONITORING
 # ═════════════════════════════════════════════════════════════════════════════════════════════════════════════════════#
 
-async def get_media_info():
-    try:
-        manager = await wmc.GlobalSystemMediaTransportControlsSessionManager.request_async()
-        session = manager.get_current_session()
-        if session:
-            props = await session.try_get_media_properties_async()
-            timeline = session.get_timeline_properties()
-            pos = timeline.position.total_seconds() * 1000
-            dur = timeline.end_time.total_seconds() * 1000
-            return props.title, props.artist, pos, dur
-    except (OSError, AttributeError, RuntimeError):
+class WinRTMediaProvider:
+    # Keeps one session manager for the whole run and forwards Windows media
+    # change events to on_change so the monitor can refresh right away.
+
+    def __init__(self):
+        self.manager = None
+        self.session = None
+        self.on_change = None
+        self.manager_token = None
+        self.session_tokens = []
+
+    async def open(self, on_change):
+        self.on_change = on_change
+        self.manager = await wmc.GlobalSystemMediaTransportControlsSessionManager.request_async()
+        self.manager_token = self.manager.add_current_session_changed(lambda sender, args: self._attach())
+        self._attach()
+
+    def _attach(self):
+        self._detach()
+        try:
+            self.session = self.manager.get_current_session()
+            if self.session:
+                notify = lambda sender, args: self.on_change()
+                self.session_tokens = [
+                    (self.session.remove_media_properties_changed, self.session.add_media_properties_changed(notify)),
+                    (self.session.remove_playback_info_changed, self.session.add_playback_info_changed(notify)),
+                    (self.session.remove_timeline_properties_changed, self.session.add_timeline_properties_changed(notify)),
+                ]
+        except (OSError, AttributeError, RuntimeError):
+            self.session = None
+        self.on_change()
+
+    def _detach(self):
+        for remove, token in self.session_tokens:
+            try:
+                remove(token)
+            except (OSError, AttributeError, RuntimeError):
+                pass
+        self.session_tokens = []
+
+    async def read(self):
+        try:
+            session = self.session
+            if session:
+                props = await session.try_get_media_properties_async()
+                timeline = session.get_timeline_properties()
+                playing = (session.get_playback_info().playback_status
+                           == wmc.GlobalSystemMediaTransportControlsSessionPlaybackStatus.PLAYING)
+                pos = timeline.position.total_seconds() * 1000
+                dur = timeline.end_time.total_seconds() * 1000
+
+                # The reported position is from last_updated_time, which can be well in the past
+                if playing:
+                    age = (datetime.datetime.now(datetime.timezone.utc) - timeline.last_updated_time).total_seconds()
+                    if age > 0:
+                        pos = min(pos + age * 1000, dur)
+
+                return props.title, props.artist, pos, dur, playing
+        except (OSError, AttributeError, RuntimeError, TypeError):
+            pass
+        return None, None, 0, 0, False
+
+    def close(self):
+        self._detach()
+        if self.manager is not None and self.manager_token is not None:
+            try:
+                self.manager.remove_current_session_changed(self.manager_token)
+            except (OSError, AttributeError, RuntimeError):
+                pass
+        self.manager = None
+        self.session = None
+
+
+class PlaybackClock(namedtuple("PlaybackClock", "position_ms duration_ms playing stamp")):
+    # Last known position and when it was taken (time.monotonic), the position in
+    # between media queries is projected from it so the progress bar keeps moving.
+
+    __slots__ = ()
+
+    def position(self, now=None):
+        if not self.playing:
+            return self.position_ms
+        if now is None:
+            now = time.monotonic()
+        return min(self.position_ms + (now - self.stamp) * 1000, self.duration_ms)
+
+
+STOPPED_CLOCK = PlaybackClock(0, 0, False, 0.0)
+
+
+class MediaMonitor:
+    # Runs one asyncio event loop on its own thread for the whole run. The provider
+    # is read straight away when it reports a change (track, playback state, seek)
+    # and otherwise only every poll_interval to resync.
+    # Any object with async open(on_change), async read() -> (title, artist,
+    # position ms, duration ms, playing) and close() can be used as the provider,
+    # e.g. a fake one when testing off Windows.
+
+    def __init__(self, provider, on_update, poll_interval=1.0):
+        self.provider = provider
+        self.on_update = on_update
+        self.poll_interval = poll_interval
+        self.loop = None
+        self.thread = None
+        self.wake = None
+        self.stopping = False
+
+    def start(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self._thread_main, name="media-monitor", daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout=2.0):
+        self.stopping = True
+        if self.loop is not None and not self.loop.is_closed():
+            try:
+                self.loop.call_soon_threadsafe(self._notify)
+            except RuntimeError:
+                pass
+        if self.thread is not None:
+            self.thread.join(timeout)
+
+    def changed(self):
+        # Called from provider event threads
+        if self.loop is not None and not self.loop.is_closed():
+            try:
+                self.loop.call_soon_threadsafe(self._notify)
+            except RuntimeError:
+                pass
+
+    def _notify(self):
+        if self.wake is not None:
+            self.wake.set()
+
+    def _thread_main(self):
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_until_complete(self._run())
+        finally:
+            self.loop.close()
+
+    async def _run(self):
+        self.wake = asyncio.Event()
+        try:
+            await self.provider.open(self.changed)
+        except (ImportError, OSError, AttributeError, RuntimeError) as e:
+            print(f"Media monitor unavailable: {e}")
+            return
+
+        try:
+            while not self.stopping:
+                self.wake.clear()
+                try:
+                    self.on_update(await self.provider.read())
+                except Exception as e:
+                    print(f"Error in media monitor: {e}")
+                try:
+                    await asyncio.wait_for(self.wake.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self.provider.close()
+
+
+class NullMediaProvider:
+    # Used where there is no media session API, the media fields just stay empty
+
+    async def open(self, on_change):
+        pass
+
+    async def read(self):
+        return None, None, 0, 0, False
+
+    def close(self):
         pass
-    return None, None, 0, 0
 
 
+media_provider_class = WinRTMediaProvider if sys.platform == "win32" else NullMediaProvider
+
+
+# Words dropped from song titles, and markers after which the rest of the title is cut
+# (featured artists etc.). Call configure_title_cleaning after changing either list.
+TITLE_JUNK_WORDS = [
+    "official", "video", "lyrics", "audio", "hd", "4k", "remastered",
+    "live", "visualizer", "explicit", "clean", "version", "mix"
+]
+TITLE_CUT_MARKERS = ["ft.", "feat.", "featuring"]
+
+_TITLE_BRACKETS = re.compile(r"\(.*?\)|\[.*?]|\{.*?}")
+_TITLE_SEPARATORS = re.compile(r"[-–|•]")
+_TITLE_SPACES = re.compile(r"\s+")
+_title_junk = None
+_title_cut = None
+
+
+def _title_words(words, tail):
+    # Words are matched literally and case-insensitively, not inside a longer word. Unlike
+    # \b that also works for words that start or end with punctuation ("c++", "(feat").
+    # An empty list gives None, as an empty alternation would match at every position.
+    if not words:
+        return None
+    return re.compile(r"(?<!\w)(" + "|".join(map(re.escape, words)) + ")" + tail, re.IGNORECASE)
+
+
+def configure_title_cleaning(junk_words=None, cut_markers=None):
+    global TITLE_JUNK_WORDS, TITLE_CUT_MARKERS, _title_junk, _title_cut
+
+    if junk_words is not None:
+        TITLE_JUNK_WORDS = list(junk_words)
+    if cut_markers is not None:
+        TITLE_CUT_MARKERS = list(cut_markers)
+
+    _title_junk = _title_words(TITLE_JUNK_WORDS, r"(?!\w)")
+    _title_cut = _title_words(TITLE_CUT_MARKERS, ".*")
+    clean_title.cache_clear()
+
+
+@functools.lru_cache(maxsize=256)
 def clean_title(raw_title):
     if not raw_title:
         return ""
 
-    title = re.sub(r"\(.*?\)|\[.*?]|\{.*?}", "", raw_title)
-    junk_words = [
-        "official", "video", "lyrics", "audio", "hd", "4k", "remastered",
-        "live", "visualizer", "explicit", "clean", "version", "mix"
-    ]
-    pattern = r"\b(" + "|".join(junk_words) + r")\b"
-    title = re.sub(pattern, "", title, flags=re.IGNORECASE)
-    title = re.sub(r"\b(ft\.|feat\.|featuring).*", "", title, flags=re.IGNORECASE)
-    parts = [p.strip() for p in re.split(r"[-–|•]", title) if len(p.strip()) > 2]
+    title = _TITLE_BRACKETS.sub("", raw_title)
+    if _title_junk is not None:
+        title = _title_junk.sub("", title)
+    if _title_cut is not None:
+        title = _title_cut.sub("", title)
+    parts = [p.strip() for p in _TITLE_SEPARATORS.split(title) if len(p.strip()) > 2]
     title = parts[0] if parts else title
 
-    return re.sub(r"\s+", " ", title).strip()
+    return _TITLE_SPACES.sub(" ", title).strip()
+
+
+configure_title_cleaning()
+
+
+# style -> (full cell, empty cell, partial cells from least to most filled)
+PROGRESS_GLYPHS = {
+    "classic": ("■", "□", ()),
+    "blocks": ("█", "░", ("▏", "▎", "▍", "▌", "▋", "▊", "▉")),
+    "line": ("━", "─", ("╾",)),
+}
+PROGRESS_STYLE = "classic"
+PROGRESS_LENGTH = 13
+
+
+class ProgressBar:
+    # Every bar a width/style can show is built up front, rendering is a list lookup.
+    # step() turns a position into the index of that bar, so callers can compare
+    # steps and only redraw (and resend) when the visible bar changes.
+
+    def __init__(self, length, style):
+        full, empty, partials = PROGRESS_GLYPHS[style]
+        self.length = length
+        self.resolution = len(partials) + 1
+        self.steps = length * self.resolution
+        self.empty_bar = "─" * length
 
+        self.table = []
+        for step in range(self.steps + 1):
+            cells, partial = divmod(step, self.resolution)
+            bar = full * cells
+            if partial:
+                bar += partials[partial - 1]
+            self.table.append(bar + empty * (length - len(bar)))
 
-def create_progress_bar(position_ms, duration_ms, length=13):
-    if duration_ms <= 0:
-        return "─" * length
-    percent = min(max(position_ms / duration_ms, 0), 1)
-    filled_len = int(length * percent)
-    return "■" * filled_len + "□" * (length - filled_len)
+    def step(self, position_ms, duration_ms):
+        if duration_ms <= 0:
+            return -1
+        percent = min(max(position_ms / duration_ms, 0), 1)
+        return int(self.steps * percent)
+
+    def render_step(self, step):
+        return self.empty_bar if step < 0 else self.table[step]
+
+    def render(self, position_ms, duration_ms):
+        return self.render_step(self.step(position_ms, duration_ms))
+
+
+def progress_bar(length=None, style=None):
+    # The settings can change PROGRESS_LENGTH/PROGRESS_STYLE at runtime, read them per call
+    return _progress_bar(length or PROGRESS_LENGTH, style or PROGRESS_STYLE)
+
+
+@functools.lru_cache(maxsize=16)
+def _progress_bar(length, style):
+    return ProgressBar(length, style)
+
+
+def create_progress_bar(position_ms, duration_ms, length=None, style=None):
+    return progress_bar(length, style).render(position_ms, duration_ms)
+
+
+def fmt_track_time(seconds):
+    minutes, seconds = divmod(max(int(seconds), 0), 60)
+    if minutes >= 60:
+        return f"{minutes // 60}:{minutes % 60:02}:{seconds:02}"
+    return f"{minutes}:{seconds:02}"
 
 
 # ═════════════════════════════════════════════════════════════════════════════════════════════════════════════════════#
-# MAIN OSC LOOP
+# SENSOR SAMPLERS
 # ═════════════════════════════════════════════════════════════════════════════════════════════════════════════════════#
 
-def run_osc_loop():
-    global running, cpu_wattage, cpu_temp, gpu_wattage, gpu_temp, client
+LHM_SAMPLE_INTERVAL = 5.0
+NETWORK_SAMPLE_INTERVAL = 1.0
+# Media changes arrive as events and the position is projected in between, this is only a resync
+MEDIA_SAMPLE_INTERVAL = 15.0
 
-    all_stats = psutil.net_io_counters(pernic=True)
-    if INTERFACE not in all_stats:
-        print(f"Error: {INTERFACE} not found. Available: {list(all_stats.keys())}")
-        running = False
-        return
+TICK_INTERVAL = 1.0
+# Longer than an LHM request can take (connect + read timeout)
+SAMPLER_JOIN_TIMEOUT = 3.0
 
-    prev = all_stats[INTERFACE]
-    prev_time = time.time()
 
-    cpu_detect = detect_cpu()
-    gpu_detect = detect_gpu()
+class SensorSnapshot:
+    # Latest value per source. Every key exists from the start and each sampler
+    # only replaces its own value, so publish/read never need a lock.
 
-    print(f"\n{'=' * 60}")
-    print(f"CPU: {cpu_detect} ({cpu_manufacturer.value})")
-    print(f"GPU: {gpu_detect}")
-    print(f"{'=' * 60}")
+    def __init__(self, defaults):
+        self._values = dict(defaults)
 
-    query_cooldown = "error"
-    cpu = "error"
-    gpu = "error"
+    def publish(self, source, value):
+        self._values[source] = value
 
-    while running:
-        try:
-            song, artist, pos, dur = asyncio.run(get_media_info())
-            clean_song = clean_title(song)
-
-            query_cooldown += 1
-            if query_cooldown >= 3:
-                lhm_data = get_lhm_data()
-                if lhm_data:
-                    cpu_temp, cpu_wattage, gpu_temp, gpu_wattage = parse_lhm_data(lhm_data)
-                    cpu = get_cpu_load_from_lhm(lhm_data)
-                    gpu = get_gpu_load_from_lhm(lhm_data)
-                else:
-                    cpu = 0
-                    gpu = 0
-                query_cooldown = 0
+    def get(self, source):
+        return self._values[source]
 
-            prev, up_raw, down_raw, prev_time = get_network_usage(prev, prev_time)
+    def read(self):
+        return dict(self._values)
 
-            cur_time_str = time.strftime("%I:%M %p")
-            progress_bar = create_progress_bar(pos, dur)
 
-            display_artist = f"-{artist}" if artist else ""
-            display_song = f"🎵 {clean_song}" if clean_song else ""
+class Sampler(threading.Thread):
+    def __init__(self, source, interval, sample, snapshot, stop_event, on_stop=None):
+        super().__init__(name=f"sampler-{source}", daemon=True)
+        self.source = source
+        self.interval = interval
+        self.sample = sample
+        self.snapshot = snapshot
+        self.stop_event = stop_event
+        self.on_stop = on_stop
 
-            page_index = int((time.time() // SWITCH_INTERVAL) % 2)
+    def run(self):
+        while not self.stop_event.is_set():
+            try:
+                value = self.sample()
+                if value is not None:
+                    self.snapshot.publish(self.source, value)
+            except Exception as e:
+                print(f"Error in {self.source} sampler: {e}")
+            self.stop_event.wait(self.interval)
 
-            if page_index == 0:
-                text = (
-                    f"{page1_line1_text}\n"
-                    f"{cur_time_str}\n"
-                    f"Download {fmt(down_raw)}\n"
-                    f"Upload {fmt(up_raw)}\n"
-                    f"{progress_bar}\n"
-                    f"{display_song} {display_artist}"
-                )
-            else:
-                text = (
-                    f"{page2_line1_text}\n"
-                    f"{cur_time_str}\n"
-                    f"{cpu_detect} {cpu}%\n"
-                    f"{cpu_wattage}w {cpu_temp}℃\n"
-                    f"{gpu_detect} {gpu}%\n"
-                    f"{gpu_wattage}w {gpu_temp}℃\n"
-                )
+        if self.on_stop is not None:
+            self.on_stop()
 
-            if client is not None:
-                client.send_message("/chatbox/input", [text, True])  # type: ignore
-            else:
-                print("Warning: OSC client not initialized")
 
-            time.sleep(5.0)
+def sample_lhm():
+    return parse_lhm_data(get_lhm_data(lhm_resolver.paths()))
 
-        except Exception as e:
-            print(f"Error in OSC loop: {e}")
-            time.sleep(1)
+
+def publish_media(snapshot):
+    def on_update(media):
+        song, artist, pos, dur, playing = media
+        snapshot.publish("media", (clean_title(song), artist, PlaybackClock(pos, dur, playing, time.monotonic())))
+
+    return on_update
+
+
+SNAPSHOT_DEFAULTS = {
+    "lhm": (),
+    "network": (0, 0, 0, 0, ""),
+    "media": ("", None, STOPPED_CLOCK),
+    "steamvr": (),
+    "vrchat": ("", "", 0, ""),
+}
+
+
+def start_samplers(snapshot, stop_event, network_monitor):
+    sources = [
+        ("lhm", LHM_SAMPLE_INTERVAL, sample_lhm),
+        ("network", NETWORK_SAMPLE_INTERVAL, network_monitor.sample),
+    ]
+
+    if os.path.isdir(VRCHAT_LOG_DIR):
+        sources.append(("vrchat", VRCHAT_LOG_INTERVAL, VRChatLogMonitor().sample))
+
+    if STEAMVR_STATS:
+        steamvr = SteamVRFrameStats()
+        sources.append(("steamvr", STEAMVR_SAMPLE_INTERVAL, steamvr.sample, steamvr.close))
+
+    samplers = [Sampler(*source[:3], snapshot, stop_event, *source[3:]) for source in sources]
+    for sampler in samplers:
+        sampler.start()
+    return samplers
 
 
 # ═════════════════════════════════════════════════════════════════════════════════════════════════════════════════════#
-# SCRIPT CONTROL
+# PAGE TEMPLATES
 # ═════════════════════════════════════════════════════════════════════════════════════════════════════════════════════#
 
-def start_script():
-    global running, client, OSC_IP, OSC_PORT, INTERFACE, SWITCH_INTERVAL, LHM_REST_API
-    global page1_line1_text, page2_line1_text
+# Each page is a template, {fields} are filled in from the sampler snapshot.
+# Pages rotate every SWITCH_INTERVAL seconds in the order listed here.
+PAGES = [
+    "{text.page1}\n"
+    "{time}\n"
+    "Download {net.down}\n"
+    "Upload {net.up}\n"
+    "{media.bar}\n"
+    "{media.song} {media.artist}",
+
+    "{text.page2}\n"
+    "{time}\n"
+    "{cpu.name} {cpu.load}%\n"
+    "{cpu.power}w {cpu.temp}℃\n"
+    "{gpu.name} {gpu.load}%\n"
+    "{gpu.power}w {gpu.temp}℃\n",
+]
+
+def media_bar_step(clock, now):
+    # The bar is part of the raw value, so a style change redraws even when the step is the same
+    bar = progress_bar()
+    return bar, bar.step(clock.position(now), clock.duration_ms)
+
+
+# field -> (read the raw source value from the render context, format it into text)
+PAGE_FIELDS = {
+    "text.page1": (lambda c: c["text"][0], str),
+    "text.page2": (lambda c: c["text"][1], str),
+    "time": (lambda c: c["time"], str),
+    "net.up": (lambda c: c["network"][0], fmt),
+    "net.down": (lambda c: c["network"][1], fmt),
+    "net.up.avg": (lambda c: c["network"][2], fmt),
+    "net.down.avg": (lambda c: c["network"][3], fmt),
+    "net.iface": (lambda c: c["network"][4], str),
+    "vrc.world": (lambda c: c["vrchat"][0], str),
+    "vrc.instance": (lambda c: c["vrchat"][1], str),
+    "vrc.players": (lambda c: c["vrchat"][2], str),
+    "vrc.event": (lambda c: c["vrchat"][3], str),
+    "vr.fps": (lambda c: (c["steamvr"] or (0,) * 5)[0], str),
+    "vr.p50": (lambda c: (c["steamvr"] or (0,) * 5)[1], str),
+    "vr.p99": (lambda c: (c["steamvr"] or (0,) * 5)[2], str),
+    "vr.reproj": (lambda c: (c["steamvr"] or (0,) * 5)[3], str),
+    "vr.dropped": (lambda c: (c["steamvr"] or (0,) * 5)[4], str),
+    "media.bar": (lambda c: media_bar_step(c["media"][2], c["now"]), lambda v: v[0].render_step(v[1])),
+    "media.elapsed": (lambda c: int(c["media"][2].position(c["now"]) // 1000), fmt_track_time),
+    "media.remaining": (lambda c: int((c["media"][2].duration_ms - c["media"][2].position(c["now"])) // 1000),
+                        lambda v: f"-{fmt_track_time(v)}"),
+    "media.duration": (lambda c: int(c["media"][2].duration_ms // 1000), fmt_track_time),
+    "media.song": (lambda c: c["media"][0], lambda v: f"🎵 {v}" if v else ""),
+    "media.artist": (lambda c: c["media"][1], lambda v: f"-{v}" if v else ""),
+    "cpu.name": (lambda c: c["hardware"][0], str),
+    "cpu.temp": (lambda c: c["primary"][0].temp, str),
+    "cpu.power": (lambda c: c["primary"][0].power, str),
+    "cpu.load": (lambda c: c["primary"][0].load, str),
+    "gpu.name": (lambda c: c["primary"][1].name or c["hardware"][1], str),
+    "gpu.temp": (lambda c: c["primary"][1].temp, str),
+    "gpu.power": (lambda c: c["primary"][1].power, str),
+    "gpu.load": (lambda c: c["primary"][1].load, str),
+    "gpu.vram": (lambda c: c["primary"][1], lambda d: fmt_vram(d.vram_used, d.vram_total)),
+}
+
+# Every CPU/GPU besides the primary ones shown above gets a page of its own
+DEVICE_PAGE = (
+    "{text.page2}\n"
+    "{time}\n"
+    "{dev.name} {dev.load}%\n"
+    "{dev.power}w {dev.temp}℃\n"
+    "{dev.vram}"
+)
+
+
+# Shown while VRChat's log says we are in a world
+VRCHAT_PAGE = (
+    "{text.page1}\n"
+    "{time}\n"
+    "🌐 {vrc.world}\n"
+    "👥 {vrc.players} players\n"
+    "{vrc.event}"
+)
+
+# Shown while SteamVR frame timing is available
+STEAMVR_PAGE = (
+    "{text.page2}\n"
+    "{time}\n"
+    "SteamVR {vr.fps} fps\n"
+    "{vr.p50}ms / p99 {vr.p99}ms\n"
+    "Reprojected {vr.reproj}%\n"
+    "Dropped {vr.dropped}"
+)
+
+
+def fmt_vram(used_mb, total_mb):
+    if not total_mb:
+        return ""
+    return f"{used_mb / 1024:.1f}/{total_mb / 1024:.1f} GB VRAM"
+
+
+def device_fields(slot):
+    def device(c):
+        devices = c["extra_devices"]
+        return devices[slot] if slot < len(devices) else NO_DEVICE
+
+    fields = dict(PAGE_FIELDS)
+    fields.update({
+        "dev.name": (lambda c: device(c).name, str),
+        "dev.load": (lambda c: device(c).load, str),
+        "dev.temp": (lambda c: device(c).temp, str),
+        "dev.power": (lambda c: device(c).power, str),
+        "dev.vram": (lambda c: device(c), lambda d: fmt_vram(d.vram_used, d.vram_total)),
+    })
+    return fields
+
+# VRChat drops anything past 144 characters or 9 lines, counting characters in UTF-16
+# units (so an emoji counts as 2). Each line also has a budget, a longer line wraps in the
+# bubble and uses up more than one of the 9 lines. When a line or the page is too long the
+# fields listed here are shortened, lowest priority first, but never below min width.
+CHATBOX_MAX_CHARS = 144
+CHATBOX_MAX_LINES = 9
+CHATBOX_LINE_CHARS = 48
+
+# field -> (priority, min width)
+FIELD_SHRINK = {
+    "media.song": (0, 8),
+    "media.artist": (1, 0),
+    "vrc.event": (1, 0),
+    "vrc.world": (2, 10),
+    "text.page1": (2, 10),
+    "text.page2": (2, 10),
+    "cpu.name": (3, 8),
+    "gpu.name": (3, 8),
+}
+
+_TEMPLATE_FIELD = re.compile(r"\{([a-z0-9_.]+)}")
+
+
+def _units(text):
+    return len(text.encode("utf-16-le")) // 2
+
+
+def _cut_units(text, units):
+    # Longest start of text that fits in units, never half of a surrogate pair
+    return text.encode("utf-16-le")[:max(units, 0) * 2].decode("utf-16-le", "ignore")
+
+
+def _truncate(text, width):
+    if _units(text) <= width:
+        return text
+    if width <= 0:
+        return ""
+    return _cut_units(text, width - 1).rstrip() + "…"
+
+
+def _fits(text):
+    if _units(text) > CHATBOX_MAX_CHARS:
+        return False
+    # A line of at most half the budget fits whatever it holds, only longer ones are measured
+    for line in text.split("\n"):
+        if len(line) * 2 > CHATBOX_LINE_CHARS and _units(line) > CHATBOX_LINE_CHARS:
+            return False
+    return True
+
+
+def _limit_lines(text):
+    lines = text.split("\n")
+    if len(lines) <= CHATBOX_MAX_LINES:
+        return text
+    return "\n".join(lines[:CHATBOX_MAX_LINES])
+
+
+class PageTemplate:
+    # Compiled once: the template is split into literal text and field slots.
+    # Each field remembers its last raw value and only re-formats when it changes.
+    # Lines or pages over the chatbox limits are fitted by shrinking fields, and the
+    # chosen widths are cached per tuple of field lengths so a repeat layout is a lookup.
+
+    LAYOUT_CACHE_SIZE = 256
+
+    def __init__(self, template, fields=None):
+        fields = PAGE_FIELDS if fields is None else fields
+        self.template = template
+        self.parts = []
+        self.slots = []
+
+        pos = 0
+        for match in _TEMPLATE_FIELD.finditer(template):
+            name = match.group(1)
+            if name not in fields:
+                raise ValueError(f"Unknown page field {{{name}}}")
+            self.parts.append(template[pos:match.start()])
+            self.slots.append((len(self.parts), name) + fields[name])
+            self.parts.append("")
+            pos = match.end()
+        self.parts.append(template[pos:])
+
+        # Line of every slot and the units of literal text on every line, newlines included
+        self.slot_lines = [template[:match.start()].count("\n") for match in _TEMPLATE_FIELD.finditer(template)]
+        literal = _TEMPLATE_FIELD.sub("", template)
+        self.line_literals = [_units(line) for line in literal.split("\n")]
+        self.literal_units = _units(literal)
+        self.shrink_order = sorted(
+            (FIELD_SHRINK[name][0], i) for i, (_, name, *_) in enumerate(self.slots) if name in FIELD_SHRINK
+        )
+
+        self.last_raw = [object()] * len(self.slots)
+        self.last_text = None
+        self.layouts = {}
+
+    def render(self, context):
+        changed = False
+        for i, (part_index, name, read, format_value) in enumerate(self.slots):
+            raw = read(context)
+            if raw != self.last_raw[i]:
+                self.last_raw[i] = raw
+                text = format_value(raw)
+                if text != self.parts[part_index]:
+                    self.parts[part_index] = text
+                    changed = True
+
+        if changed or self.last_text is None:
+            text = "".join(self.parts)
+            if not _fits(text):
+                text = self._fit()
+            self.last_text = _limit_lines(text)
+        return self.last_text
+
+    def _fit(self):
+        lengths = tuple(_units(self.parts[part_index]) for part_index, *_ in self.slots)
+        widths = self.layouts.get(lengths)
+        if widths is None:
+            if len(self.layouts) >= self.LAYOUT_CACHE_SIZE:
+                self.layouts.clear()
+            widths = self.layouts[lengths] = self._layout(lengths)
+
+        parts = list(self.parts)
+        for (part_index, *_), width in zip(self.slots, widths):
+            parts[part_index] = _truncate(parts[part_index], width)
+        return _cut_units("".join(parts), CHATBOX_MAX_CHARS)
+
+    def _layout(self, lengths):
+        # Every line is fitted to its own budget first, then the page to the total
+        widths = list(lengths)
+
+        line_units = list(self.line_literals)
+        for line, width in zip(self.slot_lines, widths):
+            line_units[line] += width
+        for line, units in enumerate(line_units):
+            if units > CHATBOX_LINE_CHARS:
+                self._shrink(widths, units - CHATBOX_LINE_CHARS, line)
+
+        excess = sum(widths) + self.literal_units - CHATBOX_MAX_CHARS
+        if excess > 0:
+            self._shrink(widths, excess)
+
+        return tuple(widths)
+
+    def _shrink(self, widths, excess, line=None):
+        for _, i in self.shrink_order:
+            if excess <= 0:
+                break
+            if line is not None and self.slot_lines[i] != line:
+                continue
+            min_width = FIELD_SHRINK[self.slots[i][1]][1]
+            cut = min(excess, max(widths[i] - min_width, 0))
+            widths[i] -= cut
+            excess -= cut
+
+
+def compile_pages(templates=None):
+    return [PageTemplate(template) for template in (PAGES if templates is None else templates)]
+
+
+def compile_device_pages(count):
+    return [PageTemplate(DEVICE_PAGE, device_fields(slot)) for slot in range(count)]
+
+
+def add_device_context(context):
+    devices = context["lhm"]
+    primary = primary_devices(devices)
+    context["primary"] = primary
+    context["extra_devices"] = tuple(d for d in devices if all(d is not p for p in primary))
+
+
+# ═════════════════════════════════════════════════════════════════════════════════════════════════════════════════════#
+# CHATBOX SENDING
+# ═════════════════════════════════════════════════════════════════════════════════════════════════════════════════════#
+
+# VRChat throttles the chatbox when it is spammed, the old builds slept 1.6s between sends
+MIN_SEND_INTERVAL = 1.6
+CHATBOX_BURST = 2
+KEEPALIVE_INTERVAL = 20.0
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self, now):
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def ready_at(self, now):
+        self._refill(now)
+        if self.tokens >= 1:
+            return now
+        return now + (1 - self.tokens) / self.rate
+
+
+class ChatboxSender:
+    # Only sends when the rendered text changed and resends unchanged text every
+    # keepalive_interval so it stays visible. Sends go through a token bucket that
+    # allows one message per min_interval with a small burst, anything submitted
+    # while it is empty is held as pending and only the newest pending text is sent.
+
+    def __init__(self, osc_client, min_interval=MIN_SEND_INTERVAL, keepalive_interval=KEEPALIVE_INTERVAL,
+                 burst=CHATBOX_BURST):
+        self.osc_client = osc_client
+        self.keepalive_interval = keepalive_interval
+        self.bucket = TokenBucket(1.0 / min_interval, burst)
+        self.last_text = None
+        self.last_send = 0.0
+        self.pending = None
+        self.sent = 0
+        self.suppressed = 0
+        self.deferred = 0
+        self.keepalives = 0
+
+    def submit(self, text, now=None):
+        if now is None:
+            now = time.monotonic()
+
+        keepalive = False
+        if text == self.last_text:
+            self.pending = None
+            if now - self.last_send < self.keepalive_interval:
+                self.suppressed += 1
+                return False
+            keepalive = True
+
+        if not self.bucket.take(now):
+            if self.pending is None:
+                self.deferred += 1
+            self.pending = text
+            return False
+
+        if keepalive:
+            self.keepalives += 1
+        else:
+            self.sent += 1
+
+        self.osc_client.send_message("/chatbox/input", [text, True])  # type: ignore
+        self.pending = None
+        self.last_text = text
+        self.last_send = now
+        return True
+
+    def next_send_at(self, now):
+        if self.pending is None:
+            return None
+        return self.bucket.ready_at(now)
 
-    if running:
+    def stats(self):
+        return f"{self.sent} sent, {self.keepalives} keepalive, {self.suppressed} suppressed, {self.deferred} deferred"
+
+
+class SendScheduler:
+    # Wakes the loop on a fixed tick grid, or earlier when the sender has pending
+    # text and a token frees up. Oversleep is measured every wake and subtracted
+    # from the next sleep so the loop does not slowly drift behind.
+
+    MAX_DRIFT = 0.05
+
+    def __init__(self, tick_interval, stop_event=None):
+        self.tick_interval = tick_interval
+        self.stop_event = threading.Event() if stop_event is None else stop_event
+        self.next_tick = time.monotonic()
+        self.drift = 0.0
+
+    def wait(self, sender=None):
+        now = time.monotonic()
+        target = self.next_tick
+        send_at = sender.next_send_at(now) if sender is not None else None
+        tick_due = send_at is None or send_at >= target
+        if not tick_due:
+            target = send_at
+
+        delay = target - now - self.drift
+        if delay > 0:
+            self.stop_event.wait(delay)
+
+        woke = time.monotonic()
+        late = woke - target
+        self.drift = min(max(self.drift + 0.25 * late, 0.0), self.MAX_DRIFT)
+
+        if tick_due:
+            self.next_tick += self.tick_interval
+            if self.next_tick <= woke:
+                self.next_tick = woke + self.tick_interval
+
+
+# ═════════════════════════════════════════════════════════════════════════════════════════════════════════════════════#
+# MAIN OSC LOOP
+# ═════════════════════════════════════════════════════════════════════════════════════════════════════════════════════#
+
+def run_osc_loop(stop_event):
+    interfaces = parse_interfaces(INTERFACE)
+    all_stats = psutil.net_io_counters(pernic=True)
+    missing = [nic for nic in interfaces or [] if nic not in all_stats]
+    if missing:
+        print(f"Error: {', '.join(missing)} not found. Available: {list(all_stats.keys())}")
         return
 
+    snapshot = SensorSnapshot(SNAPSHOT_DEFAULTS)
+    sampler_stop = threading.Event()
+    samplers = start_samplers(snapshot, sampler_stop, NetworkMonitor(interfaces))
+    media_monitor = MediaMonitor(media_provider_class(), publish_media(snapshot), MEDIA_SAMPLE_INTERVAL)
+    media_monitor.start()
+
+    pages = compile_pages()
+    device_pages = []
+    steamvr_pages = [PageTemplate(STEAMVR_PAGE)]
+    vrchat_pages = [PageTemplate(VRCHAT_PAGE)]
+    static_context = {
+        "text": (page1_line1_text, page2_line1_text),
+        "hardware": ("CPU", "GPU"),
+    }
+
+    def hardware_detected(names):
+        static_context["hardware"] = names
+        print(f"\n{'=' * 60}")
+        print(f"CPU: {names[0]} ({cpu_manufacturer.value})")
+        print(f"GPU: {names[1]}")
+        print(f"{'=' * 60}")
+
+    detect_hardware_async(hardware_detected)
+
+    sender = ChatboxSender(client) if client is not None else None
+    scheduler = SendScheduler(TICK_INTERVAL, stop_event)
+
     try:
-        OSC_IP = ip_entry.get()
-        OSC_PORT = int(port_entry.get())
-        INTERFACE = iface_entry.get()
-        SWITCH_INTERVAL = int(interval_entry.get())
-        LHM_REST_API = lhm_entry.get()
+        while not stop_event.is_set():
+            try:
+                context = snapshot.read()
+                context.update(static_context)
+                context["time"] = time.strftime("%I:%M %p")
+                context["now"] = time.monotonic()
+                add_device_context(context)
+
+                if len(device_pages) != len(context["extra_devices"]):
+                    device_pages = compile_device_pages(len(context["extra_devices"]))
+
+                rotation = pages + device_pages
+                if context["vrchat"][0]:
+                    rotation = rotation + vrchat_pages
+                if context["steamvr"]:
+                    rotation = rotation + steamvr_pages
+                page_index = int((time.time() // SWITCH_INTERVAL) % len(rotation))
+                text = rotation[page_index].render(context)
+
+                if sender is not None:
+                    sender.submit(text)
+                else:
+                    print("Warning: OSC client not initialized")
+
+                scheduler.wait(sender)
+
+            except Exception as e:
+                print(f"Error in OSC loop: {e}")
+                stop_event.wait(1)
+    finally:
+        # The next run must not start until these are done: an LHM sampler can still be
+        # in a request on the shared client, and SteamVR's close shuts OpenVR down globally
+        sampler_stop.set()
+        media_monitor.stop()
+        for sampler in samplers:
+            sampler.join(SAMPLER_JOIN_TIMEOUT)
+            if sampler.is_alive():
+                print(f"Warning: {sampler.source} sampler did not stop in time")
+        if sender is not None:
+            print(f"Chatbox: {sender.stats()}")
+
+
+# ═════════════════════════════════════════════════════════════════════════════════════════════════════════════════════#
+# SCRIPT CONTROL
+# ═════════════════════════════════════════════════════════════════════════════════════════════════════════════════════#
+
+class WorkerState(Enum):
+    STOPPED = "Stopped"
+    STARTING = "Starting"
+    RUNNING = "Running"
+    STOPPING = "Stopping"
+
+
+class WorkerSupervisor:
+    # Owns the OSC loop thread. The loop is handed a stop Event and waits on it instead
+    # of sleeping, so Stop takes effect straight away. Nothing here blocks the caller:
+    # a restart waits for the old thread on a helper thread, then starts the new one,
+    # so two loops never send at the same time. The state stays STOPPING until the old
+    # thread has really exited, however long that takes.
+
+    JOIN_TIMEOUT = 3.0
+
+    def __init__(self, target):
+        self.target = target
+        self.state = WorkerState.STOPPED
+        self.lock = threading.Lock()
+        self.thread = None
+        self.stop_event = None
+
+    def start(self, setup=None):
+        with self.lock:
+            if self.state != WorkerState.STOPPED:
+                return False
+            self.state = WorkerState.STARTING
+            self.stop_event = threading.Event()
+            self.thread = threading.Thread(target=self._run, args=(self.stop_event, setup),
+                                           name="osc-loop", daemon=True)
+            self.thread.start()
+        return True
+
+    def _run(self, stop_event, setup):
+        try:
+            if setup is not None:
+                setup()
+            with self.lock:
+                if stop_event.is_set():
+                    return
+                self.state = WorkerState.RUNNING
+            self.target(stop_event)
+        except Exception as e:
+            print(f"OSC loop stopped: {e}")
+        finally:
+            with self.lock:
+                if self.stop_event is stop_event:
+                    self.state = WorkerState.STOPPED
+
+    def stop(self):
+        with self.lock:
+            if self.state in (WorkerState.STARTING, WorkerState.RUNNING):
+                self.state = WorkerState.STOPPING
+                self.stop_event.set()
+            return self.thread
+
+    def restart(self, setup=None):
+        old_thread = self.stop()
 
-        page1_line1_text = page1_entry.get()
-        page2_line1_text = page2_entry.get()
+        def wait_then_start():
+            if old_thread is not None:
+                old_thread.join(self.JOIN_TIMEOUT)
+                if old_thread.is_alive():
+                    print("Warning: previous OSC loop did not stop in time, still waiting for it")
+                    old_thread.join()
+            self.start(setup)
 
-        client = SimpleUDPClient(OSC_IP, OSC_PORT)
+        threading.Thread(target=wait_then_start, name="osc-restart", daemon=True).start()
 
-        running = True
-        status_label.config(text="Status: Running", fg="#4CFF4C")
 
-        diagnose_lhm()
+supervisor = WorkerSupervisor(run_osc_loop)
 
-        thread = threading.Thread(target=run_osc_loop, daemon=True)
-        thread.start()
+
+def prepare_run():
+    # Runs on the worker thread, anything that can wait on the network goes here
+    global lhm_client
+
+    if lhm_client is not None:
+        lhm_client.close()
+    lhm_client = LHMClient(LHM_REST_API)
+    lhm_resolver.reset()
+    diagnose_lhm()
+
+
+def apply_settings(settings):
+    # Shared by the GUI entries and the headless config file, missing keys keep their value
+    global client, OSC_IP, OSC_PORT, INTERFACE, SWITCH_INTERVAL, LHM_REST_API
+    global page1_line1_text, page2_line1_text
+
+    osc_port = int(settings.get("osc_port", OSC_PORT))
+    switch_interval = int(settings.get("switch_interval", SWITCH_INTERVAL))
+
+    OSC_IP = settings.get("osc_ip", OSC_IP)
+    OSC_PORT = osc_port
+    INTERFACE = settings.get("interface", INTERFACE)
+    SWITCH_INTERVAL = switch_interval
+    LHM_REST_API = settings.get("lhm_rest_api", LHM_REST_API)
+
+    page1_line1_text = settings.get("page1_text", page1_line1_text)
+    page2_line1_text = settings.get("page2_text", page2_line1_text)
+
+    client = udp_client.SimpleUDPClient(OSC_IP, OSC_PORT)
+
+
+def read_settings():
+    try:
+        apply_settings({
+            "osc_ip": ip_entry.get(),
+            "osc_port": port_entry.get(),
+            "interface": iface_entry.get(),
+            "switch_interval": interval_entry.get(),
+            "lhm_rest_api": lhm_entry.get(),
+            "page1_text": page1_entry.get(),
+            "page2_text": page2_entry.get(),
+        })
+        return True
 
     except ValueError as e:
         messagebox.showerror("Error", f"Invalid input: {e}")
-        status_label.config(text="Status: Error", fg="#FF4C4C")
     except Exception as e:
         messagebox.showerror("Error", f"Failed to start: {e}")
-        status_label.config(text="Status: Error", fg="#FF4C4C")
+    status_label.config(text="Status: Error", fg="#FF4C4C")
+    return False
+
+
+def start_script():
+    if supervisor.state != WorkerState.STOPPED:
+        return
+    if read_settings():
+        supervisor.start(prepare_run)
 
 
 def stop_script():
-    global running
-    running = False
-    status_label.config(text="Status: Stopped", fg="#FF4C4C")
+    supervisor.stop()
 
 
 def restart_script():
-    stop_script()
-    time.sleep(1)
-    start_script()
+    if read_settings():
+        supervisor.restart(prepare_run)
+
+
+STATUS_COLOURS = {
+    WorkerState.STOPPED: "#FF4C4C",
+    WorkerState.STARTING: "#FFD24C",
+    WorkerState.RUNNING: "#4CFF4C",
+    WorkerState.STOPPING: "#FFD24C",
+}
+last_status = None
+
+
+def refresh_status():
+    # Worker threads never touch Tk, the label follows the supervisor state from here
+    global last_status
+
+    state = supervisor.state
+    if state != last_status:
+        last_status = state
+        status_label.config(text=f"Status: {state.value}", fg=STATUS_COLOURS[state])
+    root.after(200, refresh_status)
+
+
+# ═════════════════════════════════════════════════════════════════════════════════════════════════════════════════════#
+# HEADLESS MODE
+# ═════════════════════════════════════════════════════════════════════════════════════════════════════════════════════#
+
+# Runs the samplers and sender without a window, for running as a background service:
+#   python "OSC 0.51-Beta.py" --headless --config osc_config.json
+# SIGINT/SIGTERM stop it. SIGHUP reloads the config; Windows has no SIGHUP, so there
+# the config file is reloaded when it changes on disk instead.
+
+CONFIG_KEYS = {"osc_ip", "osc_port", "interface", "switch_interval", "lhm_rest_api", "page1_text", "page2_text"}
+CONFIG_POLL_INTERVAL = 2.0
+
+
+def load_config(path):
+    with open(path, encoding="utf-8") as f:
+        settings = json.load(f)
+    if not isinstance(settings, dict):
+        raise ValueError("config must be a JSON object")
+
+    unknown = set(settings) - CONFIG_KEYS
+    if unknown:
+        print(f"Warning: ignoring unknown config keys: {', '.join(sorted(unknown))}")
+    return {key: value for key, value in settings.items() if key in CONFIG_KEYS}
+
+
+def _config_mtime(path):
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def run_headless(config_path):
+    shutdown = threading.Event()
+    reload = threading.Event()
+    sighup = getattr(signal, "SIGHUP", None)
+
+    def on_signal(signum, frame):
+        (reload if signum == sighup else shutdown).set()
+
+    signal.signal(signal.SIGINT, on_signal)
+    signal.signal(signal.SIGTERM, on_signal)
+    if sighup is not None:
+        signal.signal(sighup, on_signal)
+    if hasattr(signal, "SIGBREAK"):
+        signal.signal(signal.SIGBREAK, on_signal)
+
+    try:
+        apply_settings(load_config(config_path))
+    except Exception as e:
+        print(f"Error: could not load config {config_path}: {e}")
+        return 1
+
+    config_mtime = _config_mtime(config_path)
+    supervisor.start(prepare_run)
+    print(f"Running headless with {config_path}")
+
+    # The main thread only wakes to handle signals and, without SIGHUP, to check the config file
+    while not shutdown.is_set():
+        shutdown.wait(CONFIG_POLL_INTERVAL)
+
+        if sighup is None:
+            mtime = _config_mtime(config_path)
+            if mtime != config_mtime:
+                config_mtime = mtime
+                reload.set()
+
+        if reload.is_set() and not shutdown.is_set():
+            reload.clear()
+            try:
+                apply_settings(load_config(config_path))
+            except Exception as e:
+                print(f"Error: config reload failed, keeping current settings: {e}")
+                continue
+            supervisor.restart(prepare_run)
+            print("Config reloaded")
+
+    print("Shutting down")
+    thread = supervisor.stop()
+    if thread is not None:
+        thread.join(supervisor.JOIN_TIMEOUT)
+    return 0
 
 
 # ═════════════════════════════════════════════════════════════════════════════════════════════════════════════════════#
@@ -520,71 +2260,106 @@ ENTRY_BG = "#1E1E1E"
 BTN_BG = "#2A2A2A"
 BTN_FG = "#FFFFFF"
 
-root = tk.Tk()
-root.title("OSC Chatbox")
-root.geometry("450x350")
-root.configure(bg=BG)
-root.resizable(True, True)
 
-frame = tk.Frame(root, bg=BG)
-frame.pack(fill="both", expand=True, padx=10, pady=10)
+def run_gui():
+    global tk, messagebox, root, status_label
+    global ip_entry, port_entry, iface_entry, interval_entry, lhm_entry, page1_entry, page2_entry
+
+    # Imported here so headless mode never loads Tk
+    import tkinter as tk
+    from tkinter import messagebox
 
+    root = tk.Tk()
+    root.title("OSC Chatbox")
+    root.geometry("450x350")
+    root.configure(bg=BG)
+    root.resizable(True, True)
 
-def dark_label(text, r):
-    lbl = tk.Label(frame, text=text, bg=BG, fg=FG, anchor="w")
-    lbl.grid(row=r, column=0, sticky="w", pady=4)
-    return lbl
+    frame = tk.Frame(root, bg=BG)
+    frame.pack(fill="both", expand=True, padx=10, pady=10)
 
+    def dark_label(text, r):
+        lbl = tk.Label(frame, text=text, bg=BG, fg=FG, anchor="w")
+        lbl.grid(row=r, column=0, sticky="w", pady=4)
+        return lbl
 
-def dark_entry(r, default=""):
-    e = tk.Entry(frame, bg=ENTRY_BG, fg=FG, insertbackground=FG, relief="flat")
-    e.insert(0, default)
-    e.grid(row=r, column=1, pady=4, sticky="ew")
-    return e
+    def dark_entry(r, default=""):
+        e = tk.Entry(frame, bg=ENTRY_BG, fg=FG, insertbackground=FG, relief="flat")
+        e.insert(0, default)
+        e.grid(row=r, column=1, pady=4, sticky="ew")
+        return e
 
+    frame.columnconfigure(1, weight=1)
 
-frame.columnconfigure(1, weight=1)
+    dark_label("OSC IP", 0)
+    ip_entry = dark_entry(0, OSC_IP)
 
-dark_label("OSC IP", 0)
-ip_entry = dark_entry(0, OSC_IP)
+    dark_label("OSC Port", 1)
+    port_entry = dark_entry(1, str(OSC_PORT))
 
-dark_label("OSC Port", 1)
-port_entry = dark_entry(1, str(OSC_PORT))
+    dark_label("Network Interface", 2)
+    iface_entry = dark_entry(2, INTERFACE)
 
-dark_label("Network Interface", 2)
-iface_entry = dark_entry(2, INTERFACE)
+    dark_label("Switch Interval", 3)
+    interval_entry = dark_entry(3, str(SWITCH_INTERVAL))
 
-dark_label("Switch Interval", 3)
-interval_entry = dark_entry(3, str(SWITCH_INTERVAL))
+    dark_label("LHM Interface", 4)
+    lhm_entry = dark_entry(4, LHM_REST_API)
 
-dark_label("LHM Interface", 4)
-lhm_entry = dark_entry(4, LHM_REST_API)
+    dark_label("Page 1 Text", 5)
+    page1_entry = dark_entry(5, "Thx for using boot's osc code")
 
-dark_label("Page 1 Text", 5)
-page1_entry = dark_entry(5, "Thx for using boot's osc code")
+    dark_label("Page 2 Text", 6)
+    page2_entry = dark_entry(6, "hi put your text here :3")
 
-dark_label("Page 2 Text", 6)
-page2_entry = dark_entry(6, "hi put your text here :3")
+    button_frame = tk.Frame(frame, bg=BG)
+    button_frame.grid(row=7, column=0, columnspan=2, pady=15, sticky="ew")
+    button_frame.columnconfigure(0, weight=1)
+    button_frame.columnconfigure(1, weight=1)
+    button_frame.columnconfigure(2, weight=1)
 
-button_frame = tk.Frame(frame, bg=BG)
-button_frame.grid(row=7, column=0, columnspan=2, pady=15, sticky="ew")
-button_frame.columnconfigure(0, weight=1)
-button_frame.columnconfigure(1, weight=1)
-button_frame.columnconfigure(2, weight=1)
+    start_btn = tk.Button(button_frame, text="Start", command=start_script,
+                          bg=BTN_BG, fg=BTN_FG, relief="flat")
+    start_btn.grid(row=0, column=0, sticky="ew", padx=2)
 
-start_btn = tk.Button(button_frame, text="Start", command=start_script,
-                      bg=BTN_BG, fg=BTN_FG, relief="flat")
-start_btn.grid(row=0, column=0, sticky="ew", padx=2)
+    stop_btn = tk.Button(button_frame, text="Stop", command=stop_script,
+                         bg=BTN_BG, fg=BTN_FG, relief="flat")
+    stop_btn.grid(row=0, column=1, sticky="ew", padx=2)
 
-stop_btn = tk.Button(button_frame, text="Stop", command=stop_script,
-                     bg=BTN_BG, fg=BTN_FG, relief="flat")
-stop_btn.grid(row=0, column=1, sticky="ew", padx=2)
+    restart_btn = tk.Button(button_frame, text="Restart", command=restart_script,
+                            bg=BTN_BG, fg=BTN_FG, relief="flat")
+    restart_btn.grid(row=0, column=2, sticky="ew", padx=2)
 
-restart_btn = tk.Button(button_frame, text="Restart", command=restart_script,
-                        bg=BTN_BG, fg=BTN_FG, relief="flat")
-restart_btn.grid(row=0, column=2, sticky="ew", padx=2)
+    status_label = tk.Label(frame, text="Status: Stopped", bg=BG, fg="#FF4C4C")
+    status_label.grid(row=8, column=0, columnspan=2)
+
+    refresh_status()
+    root.mainloop()
+
+
+# ═════════════════════════════════════════════════════════════════════════════════════════════════════════════════════#
+# ENTRY POINT
+# ═════════════════════════════════════════════════════════════════════════════════════════════════════════════════════#
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="OSC Chatbox")
+    parser.add_argument("--check-deps", action="store_true",
+                        help="check and install the dependencies again even if they were found before")
+    parser.add_argument("--headless", action="store_true",
+                        help="run without the Tkinter window, settings come from --config")
+    parser.add_argument("--config", default="osc_config.json",
+                        help="JSON config file for headless mode (default: %(default)s)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    ensure_dependencies(force=args.check_deps)
+    if args.headless:
+        return run_headless(args.config)
+    run_gui()
+    return 0
 
-status_label = tk.Label(frame, text="Status: Stopped", bg=BG, fg="#FF4C4C")
-status_label.grid(row=8, column=0, columnspan=2)
 
-root.mainloop()
\ No newline at end of file
+if __name__ == "__main__":
+    sys.exit(main())
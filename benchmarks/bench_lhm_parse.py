@@ -0,0 +1,234 @@
+"""LHM sensor parsing: the three tree walks of the 0.51 baseline against the flattened index,
+and decoding the whole response against streaming out the cached nodes.
+
+    python benchmarks/bench_lhm_parse.py
+
+Runs over every data.json under tests/fixtures/lhm. For the index, "cold" is a full
+index + vendor match (first poll, rescans) and "warm" is a poll from cached positions.
+The baseline reads at most 6 sensors and only knows Intel CPUs and Radeon GPUs, the
+index reads every stat of every CPU/GPU ("sensors read").
+
+The decode table feeds the raw bytes in LHM_STREAM_CHUNK pieces, like iter_content does.
+"json.loads" is what response.json() does with them, "stream" is read_lhm_nodes with the
+resolver's cached positions. Peak is the tracemalloc peak of one call.
+"""
+import json
+import os
+import re
+import tracemalloc
+
+from common import fixtures, load_script, per_call_us, report
+
+
+# ── 0.51 baseline, copied as it was before the index ──────────────────────────────────
+
+def legacy_parse_lhm_data(data):
+    cpu_temp_val = 0
+    cpu_power_val = 0
+    gpu_temp_val = 0
+    gpu_power_val = 0
+
+    if not data or "Children" not in data:
+        return cpu_temp_val, cpu_power_val, gpu_temp_val, gpu_power_val
+
+    try:
+        for top_level in data.get("Children", []):
+            for hardware in top_level.get("Children", []):
+                hardware_text = hardware.get("Text", "").lower()
+
+                if "intel" in hardware_text:
+                    for category in hardware.get("Children", []):
+                        category_text = category.get("Text", "").lower()
+
+                        if "temperature" in category_text:
+                            for sensor in category.get("Children", []):
+                                sensor_text = sensor.get("Text", "").lower()
+                                if "cpu package" in sensor_text:
+                                    try:
+                                        sensor_value = sensor.get("Value", 0)
+                                        numeric_str = re.sub(r'[^\d.-]', '', str(sensor_value))
+                                        cpu_temp_val = int(float(numeric_str))
+                                    except (ValueError, TypeError):
+                                        pass
+
+                        if "power" in category_text:
+                            for sensor in category.get("Children", []):
+                                sensor_text = sensor.get("Text", "").lower()
+                                if "cpu package" in sensor_text:
+                                    try:
+                                        sensor_value = sensor.get("Value", 0)
+                                        numeric_str = re.sub(r'[^\d.-]', '', str(sensor_value))
+                                        cpu_power_val = int(float(numeric_str))
+                                    except (ValueError, TypeError):
+                                        pass
+
+                elif "amd radeon" in hardware_text:
+                    for category in hardware.get("Children", []):
+                        category_text = category.get("Text", "").lower()
+
+                        if "temperature" in category_text:
+                            for sensor in category.get("Children", []):
+                                sensor_text = sensor.get("Text", "").lower()
+                                if "gpu core" in sensor_text and "distance" not in sensor_text:
+                                    try:
+                                        sensor_value = sensor.get("Value", 0)
+                                        numeric_str = re.sub(r'[^\d.-]', '', str(sensor_value))
+                                        gpu_temp_val = int(float(numeric_str))
+                                    except (ValueError, TypeError):
+                                        pass
+
+                        if "power" in category_text:
+                            for sensor in category.get("Children", []):
+                                sensor_text = sensor.get("Text", "").lower()
+                                if "gpu package" in sensor_text:
+                                    try:
+                                        sensor_value = sensor.get("Value", 0)
+                                        numeric_str = re.sub(r'[^\d.-]', '', str(sensor_value))
+                                        gpu_power_val = int(float(numeric_str))
+                                    except (ValueError, TypeError):
+                                        pass
+
+    except (KeyError, TypeError, AttributeError, ValueError):
+        pass
+
+    return cpu_temp_val, cpu_power_val, gpu_temp_val, gpu_power_val
+
+
+def legacy_get_gpu_load_from_lhm(data):
+    if not data or "Children" not in data:
+        return 0
+
+    try:
+        for top_level in data.get("Children", []):
+            for hardware in top_level.get("Children", []):
+                hardware_text = hardware.get("Text", "").lower()
+
+                if "amd radeon" in hardware_text:
+                    for category in hardware.get("Children", []):
+                        category_text = category.get("Text", "").lower()
+
+                        if "load" in category_text:
+                            for sensor in category.get("Children", []):
+                                sensor_text = sensor.get("Text", "").lower()
+                                if "gpu core" in sensor_text:
+                                    try:
+                                        sensor_value = sensor.get("Value", 0)
+                                        numeric_str = re.sub(r'[^\d.-]', '', str(sensor_value))
+                                        return int(float(numeric_str))
+                                    except (ValueError, TypeError):
+                                        pass
+    except (KeyError, TypeError, AttributeError, ValueError):
+        pass
+
+    return 0
+
+
+def legacy_get_cpu_load_from_lhm(data):
+    if not data or "Children" not in data:
+        return 0
+
+    try:
+        for top_level in data.get("Children", []):
+            for hardware in top_level.get("Children", []):
+                hardware_text = hardware.get("Text", "").lower()
+
+                if "intel" in hardware_text:
+                    for category in hardware.get("Children", []):
+                        category_text = category.get("Text", "").lower()
+
+                        if "load" in category_text:
+                            for sensor in category.get("Children", []):
+                                sensor_text = sensor.get("Text", "").lower()
+                                if "cpu total" in sensor_text:
+                                    try:
+                                        sensor_value = sensor.get("Value", 0)
+                                        numeric_str = re.sub(r'[^\d.-]', '', str(sensor_value))
+                                        return int(float(numeric_str))
+                                    except (ValueError, TypeError):
+                                        pass
+
+                elif "amd" in hardware_text and "radeon" not in hardware_text:
+                    for category in hardware.get("Children", []):
+                        category_text = category.get("Text", "").lower()
+
+                        if "load" in category_text:
+                            for sensor in category.get("Children", []):
+                                sensor_text = sensor.get("Text", "").lower()
+                                if "cpu total" in sensor_text:
+                                    try:
+                                        sensor_value = sensor.get("Value", 0)
+                                        numeric_str = re.sub(r'[^\d.-]', '', str(sensor_value))
+                                        return int(float(numeric_str))
+                                    except (ValueError, TypeError):
+                                        pass
+    except (KeyError, TypeError, AttributeError, ValueError):
+        pass
+
+    return 0
+
+
+def legacy_poll(data):
+    return legacy_parse_lhm_data(data), legacy_get_gpu_load_from_lhm(data), legacy_get_cpu_load_from_lhm(data)
+
+
+# ── Benchmark ─────────────────────────────────────────────────────────────────────────
+
+def peak_kib(func):
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def decode_rows(osc):
+    rows = []
+    for path in fixtures("lhm", "*.json"):
+        with open(path, "rb") as f:
+            raw = f.read()
+        size = osc.LHM_STREAM_CHUNK
+        chunks = [raw[i:i + size] for i in range(0, len(raw), size)]
+
+        resolver = osc.LHMSensorResolver()
+        resolver.read(json.loads(raw))
+        paths = resolver.paths()
+
+        def full():
+            return json.loads(b"".join(chunks))
+
+        def stream():
+            return osc.read_lhm_nodes(chunks, paths)
+
+        assert resolver._read_devices(stream()) == resolver._read_devices(full())
+        rows.append((os.path.basename(path), f"{len(raw) / 1024:.0f}",
+                     f"{per_call_us(full):.0f}", f"{peak_kib(full):.0f}",
+                     f"{per_call_us(stream):.0f}", f"{peak_kib(stream):.0f}"))
+    return rows
+
+
+def main():
+    osc = load_script()
+    rows = []
+    for path in fixtures("lhm", "*.json"):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+
+        resolver = osc.LHMSensorResolver()
+        resolver.read(data)
+
+        legacy = per_call_us(lambda: legacy_poll(data))
+        cold = per_call_us(lambda: osc.match_lhm_sensors(osc.index_lhm_sensors(data)))
+        warm = per_call_us(lambda: resolver._read_devices(data))
+        sensors = sum(len(stats) for *_, stats in resolver.devices)
+        rows.append((os.path.basename(path), f"{legacy:.1f}", f"{cold:.1f}", f"{warm:.1f}",
+                     f"{legacy / warm:.1f}x", sensors))
+
+    report(rows, ("fixture", "3 walks us", "index cold us", "index warm us", "warm speedup", "sensors read"))
+    print()
+    report(decode_rows(osc), ("fixture", "KiB", "json.loads us", "json.loads peak KiB",
+                              "stream us", "stream peak KiB"))
+
+
+if __name__ == "__main__":
+    main()
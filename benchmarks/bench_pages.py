@@ -0,0 +1,100 @@
+"""Page rendering: the 0.51 baseline f-strings against compiled PageTemplates.
+
+    python benchmarks/bench_pages.py
+
+"steady" renders the same values every tick (the usual case between sensor samples),
+"changing" gives the network rates a new value every tick so those slots re-format.
+Both paths do their own formatting (fmt, progress bar, song/artist decoration).
+"""
+import itertools
+
+from common import load_script, per_call_us, report
+
+
+# ── 0.51 baseline, copied as it was before the templates ──────────────────────────────
+
+def legacy_progress_bar(position_ms, duration_ms, length=13):
+    if duration_ms <= 0:
+        return "─" * length
+    percent = min(max(position_ms / duration_ms, 0), 1)
+    filled_len = int(length * percent)
+    return "■" * filled_len + "□" * (length - filled_len)
+
+
+def legacy_page(page_index, v, fmt):
+    progress_bar = legacy_progress_bar(v["pos"], v["dur"])
+    display_artist = f"-{v['artist']}" if v["artist"] else ""
+    display_song = f"🎵 {v['song']}" if v["song"] else ""
+
+    if page_index == 0:
+        return (
+            f"{v['page1']}\n"
+            f"{v['time']}\n"
+            f"Download {fmt(v['down'])}\n"
+            f"Upload {fmt(v['up'])}\n"
+            f"{progress_bar}\n"
+            f"{display_song} {display_artist}"
+        )
+    return (
+        f"{v['page2']}\n"
+        f"{v['time']}\n"
+        f"{v['cpu_name']} {v['cpu']}%\n"
+        f"{v['cpu_w']}w {v['cpu_t']}℃\n"
+        f"{v['gpu_name']} {v['gpu']}%\n"
+        f"{v['gpu_w']}w {v['gpu_t']}℃\n"
+    )
+
+
+# ── Benchmark ─────────────────────────────────────────────────────────────────────────
+
+def main():
+    osc = load_script()
+    cpu = osc.DeviceReading("cpu", "Intel Core i7-12700K", 23, 54, 61, 0, 0)
+    gpu = osc.DeviceReading("gpu", "NVIDIA GeForce RTX 3070", 41, 63, 142, 3120, 8192)
+    values = {
+        "page1": "Thx for using boot's osc code", "page2": "hi put your text here :3", "time": "09:41 PM",
+        "down": 1843200.0, "up": 48000.0, "pos": 61000, "dur": 212000,
+        "song": "Never Gonna Give You Up", "artist": "Rick Astley",
+        "cpu_name": cpu.name, "cpu": cpu.load, "cpu_w": cpu.power, "cpu_t": cpu.temp,
+        "gpu_name": gpu.name, "gpu": gpu.load, "gpu_w": gpu.power, "gpu_t": gpu.temp,
+    }
+
+    snapshot = osc.SensorSnapshot(osc.SNAPSHOT_DEFAULTS)
+    snapshot.publish("lhm", (cpu, gpu))
+    snapshot.publish("network", (values["up"], values["down"], values["up"], values["down"], "Ethernet"))
+    snapshot.publish("media", (values["song"], values["artist"], osc.PlaybackClock(61000, 212000, False, 0.0)))
+
+    def build_context(up=values["up"], down=values["down"]):
+        context = snapshot.read()
+        context.update({"text": (values["page1"], values["page2"]), "hardware": (cpu.name, gpu.name)})
+        context["time"] = values["time"]
+        context["now"] = 0.0
+        context["network"] = (up, down, up, down, "Ethernet")
+        osc.add_device_context(context)
+        return context
+
+    pages = osc.compile_pages()
+    steady = build_context()
+    rates = itertools.cycle([build_context(1000.0 * i, 50000.0 * i) for i in range(1, 50)])
+    changing_values = itertools.cycle([dict(values, up=1000.0 * i, down=50000.0 * i) for i in range(1, 50)])
+
+    for page_index, page in enumerate(pages):
+        assert page.render(steady) == legacy_page(page_index, values, osc.fmt)
+
+    rows = []
+    for page_index, page in enumerate(pages):
+        legacy_steady = per_call_us(lambda: legacy_page(page_index, values, osc.fmt))
+        template_steady = per_call_us(lambda: page.render(steady))
+        legacy_changing = per_call_us(lambda: legacy_page(page_index, next(changing_values), osc.fmt))
+        template_changing = per_call_us(lambda: page.render(next(rates)))
+        rows.append((f"page {page_index + 1}", f"{legacy_steady:.2f}", f"{template_steady:.2f}",
+                     f"{legacy_changing:.2f}", f"{template_changing:.2f}"))
+
+    context_us = per_call_us(build_context)
+    report(rows, ("page", "f-string steady us", "template steady us", "f-string changing us",
+                  "template changing us"))
+    print(f"building the render context: {context_us:.2f} us per tick (shared by every page)")
+
+
+if __name__ == "__main__":
+    main()
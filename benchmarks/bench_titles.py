@@ -0,0 +1,75 @@
+"""Song title cleaning: the 0.51 baseline against the precompiled, cached pipeline.
+
+    python benchmarks/bench_titles.py
+
+Runs over tests/fixtures/titles.txt, song titles as YouTube and Spotify report them.
+"cold" clears the cache before every title (a new song each call), "repeat" cleans the
+same title again, which is what every tick between song changes does.
+"""
+import os
+import re
+
+from common import FIXTURES, load_script, per_call_us, report
+
+
+# ── 0.51 baseline, copied as it was before the pipeline ───────────────────────────────
+
+def legacy_clean_title(raw_title):
+    if not raw_title:
+        return ""
+
+    title = re.sub(r"\(.*?\)|\[.*?]|\{.*?}", "", raw_title)
+    junk_words = [
+        "official", "video", "lyrics", "audio", "hd", "4k", "remastered",
+        "live", "visualizer", "explicit", "clean", "version", "mix"
+    ]
+    pattern = r"\b(" + "|".join(junk_words) + r")\b"
+    title = re.sub(pattern, "", title, flags=re.IGNORECASE)
+    title = re.sub(r"\b(ft\.|feat\.|featuring).*", "", title, flags=re.IGNORECASE)
+    parts = [p.strip() for p in re.split(r"[-–|•]", title) if len(p.strip()) > 2]
+    title = parts[0] if parts else title
+
+    return re.sub(r"\s+", " ", title).strip()
+
+
+# ── Benchmark ─────────────────────────────────────────────────────────────────────────
+
+def load_titles():
+    with open(os.path.join(FIXTURES, "titles.txt"), encoding="utf-8") as f:
+        return [line.rstrip("\n") for line in f if line.strip() and not line.startswith("#")]
+
+
+def main():
+    osc = load_script()
+    titles = load_titles()
+
+    for title in titles:
+        assert osc.clean_title(title) == legacy_clean_title(title), title
+
+    def legacy_corpus():
+        for title in titles:
+            legacy_clean_title(title)
+
+    def cold_corpus():
+        for title in titles:
+            osc.clean_title.cache_clear()
+            osc.clean_title(title)
+
+    def repeat_corpus():
+        for title in titles:
+            osc.clean_title(title)
+
+    osc.clean_title.cache_clear()
+    repeat_corpus()
+    per_title = len(titles)
+    rows = [
+        ("0.51 baseline", f"{per_call_us(legacy_corpus) / per_title:.2f}"),
+        ("pipeline, cold", f"{per_call_us(cold_corpus) / per_title:.2f}"),
+        ("pipeline, repeat", f"{per_call_us(repeat_corpus) / per_title:.2f}"),
+    ]
+    report(rows, ("clean_title", "us per title"))
+    print(f"{per_title} titles from tests/fixtures/titles.txt")
+
+
+if __name__ == "__main__":
+    main()
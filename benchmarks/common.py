@@ -0,0 +1,38 @@
+import glob
+import importlib.util
+import os
+import sys
+import timeit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.join(HERE, os.pardir)
+SCRIPT = os.path.join(ROOT, "OSC", "OSC", "OSC 0.51-Beta.py")
+FIXTURES = os.path.join(ROOT, "tests", "fixtures")
+
+
+def load_script():
+    spec = importlib.util.spec_from_file_location("osc_chatbox", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def fixtures(*pattern):
+    return sorted(glob.glob(os.path.join(FIXTURES, *pattern)))
+
+
+def per_call_us(func, repeat=5, min_time=0.2):
+    # Best of `repeat` runs, each long enough to smooth out the timer
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    number = max(number, int(number * min_time / 0.2))
+    return min(timer.repeat(repeat, number)) / number * 1e6
+
+
+def report(rows, headers):
+    widths = [max(len(str(row[i])) for row in rows + [headers]) for i in range(len(headers))]
+    line = "  ".join(f"{{:<{w}}}" for w in widths)
+    print(line.format(*headers))
+    for row in rows:
+        print(line.format(*row))
+    sys.stdout.flush()
@@ -0,0 +1,60 @@
+"""Startup import budget: what loads before the window opens.
+
+    python benchmarks/importtime.py
+
+Runs the script up to the point where run_gui() would create the window (module load
+plus the tkinter import) in a fresh `python -X importtime` process. Fails if that takes
+longer than BUDGET_MS or if any of the lazily loaded packages got imported on the way.
+"""
+import re
+import subprocess
+import sys
+
+from common import SCRIPT
+
+BUDGET_MS = 100
+LAZY_PACKAGES = ["psutil", "requests", "pythonosc", "winrt", "openvr", "asyncio"]
+
+CHILD = f"""
+import importlib.util, time
+started = time.perf_counter()
+spec = importlib.util.spec_from_file_location("osc_chatbox", {SCRIPT!r})
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+import tkinter
+print(f"STARTUP_MS {{(time.perf_counter() - started) * 1000:.1f}}")
+"""
+
+_IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def main():
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", CHILD],
+                            capture_output=True, text=True, check=True)
+    startup_ms = float(re.search(r"STARTUP_MS ([\d.]+)", result.stdout).group(1))
+
+    imports = []
+    for match in _IMPORT_LINE.finditer(result.stderr):
+        self_us, cumulative_us, indent, name = match.groups()
+        if not indent:
+            imports.append((int(cumulative_us), name))
+    imported = {match.group(4) for match in _IMPORT_LINE.finditer(result.stderr)}
+    eager = sorted(name for name in imported if name.split(".")[0] in LAZY_PACKAGES)
+
+    print(f"script load + tkinter import: {startup_ms:.1f} ms (budget {BUDGET_MS} ms)")
+    print("slowest top level imports:")
+    for cumulative_us, name in sorted(imports, reverse=True)[:8]:
+        print(f"  {cumulative_us / 1000:7.1f} ms  {name}")
+
+    failed = False
+    if startup_ms > BUDGET_MS:
+        print(f"FAIL: over budget by {startup_ms - BUDGET_MS:.1f} ms")
+        failed = True
+    if eager:
+        print(f"FAIL: imported before the window opens: {', '.join(eager)}")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+import importlib.util
+import os
+import time
+
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SCRIPT = os.path.join(HERE, os.pardir, "OSC", "OSC", "OSC 0.51-Beta.py")
+FIXTURES = os.path.join(HERE, "fixtures")
+
+
+def load_script():
+    # The script has spaces in its name, so it is loaded from its path instead of imported
+    spec = importlib.util.spec_from_file_location("osc_chatbox", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def fixture_path(*parts):
+    return os.path.join(FIXTURES, *parts)
+
+
+class FakeMediaProvider:
+    def __init__(self, media=("Song", "Artist", 1000, 200000, True), open_error=None):
+        self.media = media
+        self.open_error = open_error
+        self.on_change = None
+        self.reads = 0
+        self.closed = False
+
+    async def open(self, on_change):
+        if self.open_error is not None:
+            raise self.open_error
+        self.on_change = on_change
+
+    async def read(self):
+        self.reads += 1
+        return self.media
+
+    def close(self):
+        self.closed = True
+
+
+class FakeOSCClient:
+    def __init__(self):
+        self.messages = []
+
+    def send_message(self, address, value):
+        self.messages.append((address, value))
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+@pytest.fixture(scope="session")
+def osc():
+    return load_script()
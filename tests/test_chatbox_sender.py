@@ -0,0 +1,56 @@
+import time
+
+import pytest
+
+from conftest import FakeOSCClient
+
+
+@pytest.fixture
+def client():
+    return FakeOSCClient()
+
+
+@pytest.fixture
+def start():
+    # The token bucket is stamped with time.monotonic() when it is made, so the explicit
+    # now values are offsets from a point that is never behind it
+    return time.monotonic() + 1.0
+
+
+def test_unchanged_text_is_suppressed(osc, client, start):
+    sender = osc.ChatboxSender(client, min_interval=1.0, keepalive_interval=20.0, burst=2)
+
+    assert sender.submit("hello", now=start)
+    assert not sender.submit("hello", now=start + 5.0)
+    assert not sender.submit("hello", now=start + 19.0)
+
+    assert client.messages == [("/chatbox/input", ["hello", True])]
+    assert (sender.sent, sender.suppressed, sender.keepalives) == (1, 2, 0)
+
+
+def test_keepalive_resends_after_the_interval(osc, client, start):
+    sender = osc.ChatboxSender(client, min_interval=1.0, keepalive_interval=20.0, burst=2)
+
+    sender.submit("hello", now=start)
+    assert not sender.submit("hello", now=start + 19.9)
+    assert sender.submit("hello", now=start + 20.0)
+    assert not sender.submit("hello", now=start + 30.0)
+    assert sender.submit("hello", now=start + 40.0)
+
+    assert [value for _, value in client.messages] == [["hello", True]] * 3
+    assert (sender.sent, sender.keepalives) == (1, 2)
+
+
+def test_counters_add_up(osc, client, start):
+    sender = osc.ChatboxSender(client, min_interval=1.0, keepalive_interval=10.0, burst=2)
+
+    texts = ["a", "a", "b", "b", "c", "c", "c", "d", "d", "d"]
+    for second, text in enumerate(texts):
+        sender.submit(text, now=start + second * 2.0)
+    for second in range(10, 20):
+        sender.submit("d", now=start + second * 2.0)
+
+    assert sender.sent + sender.keepalives == len(client.messages)
+    assert sender.sent + sender.keepalives + sender.suppressed == len(texts) + 10
+    assert (sender.sent, sender.keepalives, sender.deferred) == (4, 2, 0)
+    assert sender.stats() == f"4 sent, 2 keepalive, {sender.suppressed} suppressed, 0 deferred"
@@ -0,0 +1,105 @@
+import json
+import threading
+
+import pytest
+
+
+@pytest.fixture
+def hardware(osc, monkeypatch, tmp_path):
+    names = {"cpu": "Intel Core i7-12700K", "gpu": "NVIDIA GeForce RTX 3070"}
+    monkeypatch.setattr(osc, "HARDWARE_CACHE", str(tmp_path / "hardware.json"))
+    monkeypatch.setattr(osc, "hardware_rechecked", False)
+    monkeypatch.setattr(osc, "detect_cpu", lambda: names["cpu"])
+    monkeypatch.setattr(osc, "detect_gpu", lambda: names["gpu"])
+    monkeypatch.setattr(osc, "cpu_manufacturer", osc.CPUManufacturer.INTEL)
+    return names
+
+
+@pytest.fixture
+def detections(osc, monkeypatch):
+    calls = []
+    query_hardware = osc.query_hardware
+    monkeypatch.setattr(osc, "query_hardware", lambda: calls.append(1) or query_hardware())
+    return calls
+
+
+def detect_and_wait(osc):
+    results = []
+    osc.detect_hardware_async(results.append)
+    for thread in threading.enumerate():
+        if thread.name == "hardware-detect":
+            thread.join(2)
+    return results
+
+
+def age_cache(osc, seconds):
+    with open(osc.HARDWARE_CACHE, encoding="utf-8") as f:
+        cached = json.load(f)
+    cached["checked_at"] -= seconds
+    with open(osc.HARDWARE_CACHE, "w", encoding="utf-8") as f:
+        json.dump(cached, f)
+
+
+def cached_names(osc):
+    cached = osc.load_cached_hardware()
+    return cached and cached[0]
+
+
+def test_detected_names_are_cached(osc, hardware):
+    assert osc.detect_hardware() == ("Intel Core i7-12700K", "NVIDIA GeForce RTX 3070")
+    assert cached_names(osc) == ("Intel Core i7-12700K", "NVIDIA GeForce RTX 3070")
+
+
+def test_failed_detection_is_not_cached(osc, hardware):
+    hardware["gpu"] = "GPU Unknown"
+
+    assert osc.detect_hardware() == ("Intel Core i7-12700K", "GPU Unknown")
+    assert osc.load_cached_hardware() is None
+
+
+def test_fresh_cache_hit_runs_no_detection(osc, hardware, detections):
+    osc.detect_hardware()
+    detections.clear()
+
+    for _ in range(3):
+        assert detect_and_wait(osc) == [("Intel Core i7-12700K", "NVIDIA GeForce RTX 3070")]
+    assert detections == []
+
+
+def test_stale_cache_hit_is_rechecked_once_per_run(osc, hardware, detections):
+    osc.detect_hardware()
+    age_cache(osc, osc.HARDWARE_RECHECK_AGE + 60)
+    hardware["gpu"] = "AMD Radeon RX 7900 XTX"
+    detections.clear()
+
+    results = detect_and_wait(osc)
+    age_cache(osc, osc.HARDWARE_RECHECK_AGE + 60)
+    detect_and_wait(osc)
+
+    assert results == [("Intel Core i7-12700K", "NVIDIA GeForce RTX 3070"),
+                       ("Intel Core i7-12700K", "AMD Radeon RX 7900 XTX")]
+    assert cached_names(osc) == ("Intel Core i7-12700K", "AMD Radeon RX 7900 XTX")
+    assert len(detections) == 1
+
+
+def test_unchanged_recheck_moves_the_check_time_and_failed_one_keeps_the_cache(osc, hardware):
+    osc.detect_hardware()
+    age_cache(osc, osc.HARDWARE_RECHECK_AGE + 60)
+
+    assert detect_and_wait(osc) == [("Intel Core i7-12700K", "NVIDIA GeForce RTX 3070")]
+    _, checked_at = osc.load_cached_hardware()
+    assert checked_at > osc.time.time() - 60
+
+    age_cache(osc, osc.HARDWARE_RECHECK_AGE + 60)
+    osc.hardware_rechecked = False
+    hardware["gpu"] = "GPU Unknown"
+    assert detect_and_wait(osc) == [("Intel Core i7-12700K", "NVIDIA GeForce RTX 3070")]
+    assert cached_names(osc) == ("Intel Core i7-12700K", "NVIDIA GeForce RTX 3070")
+
+
+def test_cache_from_another_machine_is_ignored(osc, hardware):
+    with open(osc.HARDWARE_CACHE, "w", encoding="utf-8") as f:
+        json.dump({"fingerprint": "elsewhere", "manufacturer": "Intel", "cpu": "Old CPU", "gpu": "Old GPU"}, f)
+
+    assert osc.load_cached_hardware() is None
+    assert detect_and_wait(osc) == [("Intel Core i7-12700K", "NVIDIA GeForce RTX 3070")]
@@ -0,0 +1,174 @@
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from conftest import fixture_path
+
+
+class StubLHM:
+    # Serves a data.json like LibreHardwareMonitor's web server, with an ETag and keep-alive
+
+    def __init__(self, body):
+        self.body = body
+        self.etag = '"v1"'
+        self.delay = 0.0
+        self.status = 200
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                stub.requests.append((self.client_address, self.headers.get("If-None-Match")))
+                if stub.delay:
+                    time.sleep(stub.delay)
+                if stub.status != 200:
+                    self._reply(stub.status, b"")
+                elif self.headers.get("If-None-Match") == stub.etag:
+                    self._reply(304, b"")
+                else:
+                    self._reply(200, stub.body, {"Content-Type": "application/json", "ETag": stub.etag})
+
+            def _reply(self, status, body, headers=None):
+                self.send_response(status)
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/data.json"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub():
+    with open(fixture_path("lhm", "intel_nvidia.json"), "rb") as f:
+        server = StubLHM(f.read())
+    yield server
+    server.close()
+
+
+def closed_port_url():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    return f"http://127.0.0.1:{port}/data.json"
+
+
+def test_fetch_parses_the_tree(osc, stub):
+    client = osc.LHMClient(stub.url)
+    data = client.fetch()
+    client.close()
+
+    assert data["Children"][0]["Text"] == "DESKTOP-7Q2K1RM"
+    assert client.etag == '"v1"'
+
+
+def test_unchanged_tree_is_revalidated_with_etag_on_one_connection(osc, stub):
+    client = osc.LHMClient(stub.url)
+    first = client.fetch()
+    second = client.fetch()
+    client.close()
+
+    assert second is first
+    assert [etag for _, etag in stub.requests] == [None, '"v1"']
+    assert len({address for address, _ in stub.requests}) == 1
+
+
+def test_changed_etag_fetches_the_new_tree(osc, stub):
+    client = osc.LHMClient(stub.url)
+    first = client.fetch()
+    stub.etag = '"v2"'
+    stub.body = stub.body.replace(b"DESKTOP-7Q2K1RM", b"RENAMED-PC")
+    second = client.fetch()
+    client.close()
+
+    assert second is not first
+    assert second["Children"][0]["Text"] == "RENAMED-PC"
+    assert client.etag == '"v2"'
+
+
+def test_read_timeout_fails_fast_and_backs_off(osc, stub):
+    client = osc.LHMClient(stub.url)
+    client.READ_TIMEOUT = 0.2
+    stub.delay = 1.0
+
+    started = time.monotonic()
+    assert client.fetch() is None
+    assert time.monotonic() - started < 0.9
+    assert client.backoff == osc.LHMClient.BACKOFF_START
+
+    # Backing off: no request is made until retry_at
+    sent = len(stub.requests)
+    assert client.fetch() is None
+    assert len(stub.requests) == sent
+    client.close()
+
+
+def test_backoff_doubles_up_to_the_cap_and_resets_on_success(osc, stub):
+    client = osc.LHMClient(closed_port_url())
+    backoffs = []
+    for _ in range(10):
+        client.retry_at = 0.0
+        assert client.fetch() is None
+        backoffs.append(client.backoff)
+
+    assert backoffs[:4] == [1.0, 2.0, 4.0, 8.0]
+    assert backoffs[-1] == osc.LHMClient.BACKOFF_MAX
+
+    client.url = stub.url
+    client.retry_at = 0.0
+    assert client.fetch() is not None
+    assert client.backoff == 0.0 and client.retry_at == 0.0
+    client.close()
+
+
+def test_error_status_counts_as_a_failure(osc, stub):
+    stub.status = 500
+    client = osc.LHMClient(stub.url)
+
+    assert client.fetch() is None
+    assert client.backoff == osc.LHMClient.BACKOFF_START
+    client.close()
+
+
+def test_polls_from_cached_positions_stream_on_the_same_connection(osc, stub):
+    client = osc.LHMClient(stub.url)
+    resolver = osc.LHMSensorResolver()
+    readings = resolver.read(client.fetch())
+
+    stub.etag = '"v2"'
+    data = client.fetch(resolver.paths())
+    client.close()
+
+    assert isinstance(data["Children"], dict)
+    assert resolver.read(data) == readings
+    assert len({address for address, _ in stub.requests}) == 1
+
+
+def test_etag_is_only_reused_for_the_same_nodes(osc, stub):
+    client = osc.LHMClient(stub.url)
+    resolver = osc.LHMSensorResolver()
+    resolver.read(client.fetch())
+    paths = resolver.paths()
+
+    client.fetch(paths)
+    client.fetch(paths)
+    client.fetch()
+    client.close()
+
+    assert [etag for _, etag in stub.requests] == [None, None, '"v1"', None]
@@ -0,0 +1,75 @@
+import glob
+import json
+import os
+
+import pytest
+
+from conftest import fixture_path
+
+FIXTURES = sorted(glob.glob(fixture_path("lhm", "*.json")))
+
+
+def chunked(raw, size):
+    return [raw[i:i + size] for i in range(0, len(raw), size)]
+
+
+def warm_resolver(osc, raw):
+    resolver = osc.LHMSensorResolver()
+    readings = resolver.read(json.loads(raw))
+    return resolver, readings
+
+
+@pytest.mark.parametrize("path", FIXTURES, ids=os.path.basename)
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096, 1 << 20])
+def test_streamed_nodes_read_like_the_full_tree(osc, path, chunk_size):
+    with open(path, "rb") as f:
+        raw = f.read()
+    resolver, readings = warm_resolver(osc, raw)
+
+    data = osc.read_lhm_nodes(chunked(raw, chunk_size), resolver.paths())
+
+    assert resolver.read(data) == readings
+
+
+def test_only_the_requested_nodes_are_kept(osc):
+    raw = json.dumps({"Text": "Sensor", "Children": [{"Text": "PC", "Children": [
+        {"Text": "Disk", "Value": "", "Children": [{"Text": "Temp", "Value": "30 °C", "Children": []}]},
+        {"Text": "CPU", "Value": "", "Children": [{"Text": "Load", "Value": "12 %", "Children": []}]},
+    ]}]}).encode()
+
+    data = osc.read_lhm_nodes([raw], {(0, 1), (0, 1, 0)})
+
+    cpu = data["Children"][0]["Children"][1]
+    assert list(data["Children"][0]["Children"]) == [1]
+    assert cpu["Text"] == "CPU"
+    assert cpu["Children"][0] == {"Text": "Load", "Value": "12 %", "Children": {}}
+
+
+def test_brackets_and_quotes_inside_strings_are_skipped(osc):
+    raw = (b'{"Text": "Sensor", "Children": [{"Text": "PC", "Children": ['
+           b'{"Text": "Odd [name] {x} \\"quoted\\" \\\\", "Children": [{"Text": "]}", "Children": []}]},'
+           b'{"Text": "Wanted", "Value": "1 %", "Children": []}]}]}')
+
+    for size in (1, 5, len(raw)):
+        data = osc.read_lhm_nodes(chunked(raw, size), {(0, 1)})
+        assert data["Children"][0]["Children"][1]["Text"] == "Wanted"
+
+
+def test_truncated_data_is_an_error(osc):
+    with open(fixture_path("lhm", "intel_nvidia.json"), "rb") as f:
+        raw = f.read()
+    resolver, _ = warm_resolver(osc, raw)
+
+    with pytest.raises(ValueError):
+        osc.read_lhm_nodes(chunked(raw[:len(raw) // 3], 512), resolver.paths())
+
+
+def test_moved_node_keeps_the_readings_and_asks_for_the_full_tree(osc):
+    with open(fixture_path("lhm", "intel_nvidia.json"), "rb") as f:
+        raw = f.read()
+    resolver, _ = warm_resolver(osc, raw)
+    paths = resolver.paths()
+    renamed = raw.replace(b"NVIDIA GeForce RTX 3070", b"NVIDIA GeForce RTX 3080")
+
+    assert resolver.read(osc.read_lhm_nodes([renamed], paths)) is None
+    assert resolver.paths() is None
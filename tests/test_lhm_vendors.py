@@ -0,0 +1,83 @@
+import json
+
+import pytest
+
+from conftest import fixture_path
+
+# fixture -> (primary CPU, primary GPU, number of CPU/GPU devices found)
+EXPECTED = {
+    "intel_nvidia.json": (
+        ("cpu", "Intel Core i7-12700K", 23, 54, 61, 0, 0),
+        ("gpu", "NVIDIA GeForce RTX 3070", 41, 63, 142, 3120, 8192),
+        3,
+    ),
+    "amd_radeon.json": (
+        ("cpu", "AMD Ryzen 7 7800X3D", 17, 61, 48, 0, 0),
+        ("gpu", "AMD Radeon RX 7900 XTX", 56, 67, 287, 6310, 24560),
+        3,
+    ),
+    "intel_arc.json": (
+        ("cpu", "Intel Core i5-13600K", 12, 49, 44, 0, 0),
+        ("gpu", "Intel Arc A770 Graphics", 38, 58, 121, 4200, 16256),
+        2,
+    ),
+    "ryzen_nvidia.json": (
+        ("cpu", "AMD Ryzen 9 5950X", 9, 58, 92, 0, 0),
+        ("gpu", "NVIDIA GeForce RTX 4090", 72, 66, 318, 11840, 24564),
+        2,
+    ),
+    "large_rig.json": (
+        ("cpu", "Intel Core i9-13900K", 35, 71, 188, 0, 0),
+        ("gpu", "NVIDIA GeForce RTX 3090", 88, 69, 331, 18000, 24576),
+        4,
+    ),
+}
+
+
+def load(name):
+    with open(fixture_path("lhm", name), encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.mark.parametrize("name", sorted(EXPECTED))
+def test_vendor_rules_read_every_fixture(osc, name):
+    cpu, gpu, count = EXPECTED[name]
+    devices = osc.LHMSensorResolver().read(load(name))
+
+    assert osc.primary_devices(devices) == (osc.DeviceReading(*cpu), osc.DeviceReading(*gpu))
+    assert len(devices) == count
+
+
+@pytest.mark.parametrize("name", sorted(EXPECTED))
+def test_cached_positions_read_the_same_values(osc, name):
+    data = load(name)
+    resolver = osc.LHMSensorResolver()
+    first = resolver.read(data)
+
+    assert resolver.read(data) == first
+    assert resolver.polls == 1
+
+
+def test_every_discrete_gpu_reports_vram(osc):
+    for name in EXPECTED:
+        for device in osc.LHMSensorResolver().read(load(name)):
+            if device.kind == "gpu" and "UHD" not in device.name:
+                assert device.vram_total > 0, (name, device.name)
+
+
+def test_name_only_match_skips_devices_without_sensors(osc):
+    # amd_radeon.json comes from a build without HardwareId, its "INTEL SSD" matches the Intel CPU name rule
+    names = [device.name for device in osc.LHMSensorResolver().read(load("amd_radeon.json"))]
+
+    assert not any("SSD" in name for name in names)
+
+
+def test_moved_sensor_triggers_a_rescan(osc):
+    data = load("intel_nvidia.json")
+    resolver = osc.LHMSensorResolver()
+    first = resolver.read(data)
+
+    machine = data["Children"][0]["Children"]
+    machine.insert(0, machine.pop())
+    assert resolver.read(data) == first
+    assert resolver.polls == 0
@@ -0,0 +1,48 @@
+import threading
+
+from conftest import FakeMediaProvider, wait_for
+
+
+def test_reads_on_start_and_on_change(osc):
+    provider = FakeMediaProvider()
+    updates = []
+    monitor = osc.MediaMonitor(provider, updates.append, poll_interval=60)
+    monitor.start()
+
+    assert wait_for(lambda: len(updates) == 1)
+    provider.media = ("Other Song", "Other Artist", 0, 180000, True)
+    provider.on_change()
+    assert wait_for(lambda: len(updates) == 2)
+    monitor.stop()
+
+    assert updates[-1][0] == "Other Song"
+    assert provider.reads == 2
+    assert provider.closed
+    assert not monitor.thread.is_alive()
+
+
+def test_missing_backend_is_reported_in_one_line(osc, capsys):
+    errors = []
+    previous_hook = threading.excepthook
+    threading.excepthook = errors.append
+    try:
+        provider = FakeMediaProvider(open_error=ModuleNotFoundError("No module named 'winrt'"))
+        monitor = osc.MediaMonitor(provider, lambda media: None)
+        monitor.start()
+        monitor.thread.join(2)
+    finally:
+        threading.excepthook = previous_hook
+
+    assert not monitor.thread.is_alive()
+    assert errors == []
+    assert capsys.readouterr().out == "Media monitor unavailable: No module named 'winrt'\n"
+
+
+def test_null_provider_leaves_media_empty(osc):
+    updates = []
+    monitor = osc.MediaMonitor(osc.NullMediaProvider(), updates.append, poll_interval=60)
+    monitor.start()
+    assert wait_for(lambda: updates)
+    monitor.stop()
+
+    assert updates == [(None, None, 0, 0, False)]
@@ -0,0 +1,71 @@
+from collections import namedtuple
+
+import pytest
+
+Counters = namedtuple("Counters", "bytes_sent bytes_recv")
+Stats = namedtuple("Stats", "isup")
+
+
+class FakePsutil:
+    def __init__(self, up):
+        self.totals = {}
+        self.up = up
+
+    def net_io_counters(self, pernic=False):
+        return {nic: Counters(sent, recv) for nic, (sent, recv) in self.totals.items()}
+
+    def net_if_stats(self):
+        return {nic: Stats(nic in self.up) for nic in self.totals}
+
+    def add(self, nic, sent, recv):
+        total_sent, total_recv = self.totals.get(nic, (0, 0))
+        self.totals[nic] = (total_sent + sent, total_recv + recv)
+
+
+@pytest.fixture
+def fake_psutil(osc, monkeypatch):
+    def install(nics, up):
+        fake = FakePsutil(up)
+        for nic in nics:
+            fake.add(nic, 0, 0)
+        monkeypatch.setattr(osc, "psutil", fake)
+        return fake
+    return install
+
+
+def test_auto_keeps_local_area_connection_and_skips_loopback(osc, fake_psutil):
+    nics = ["Loopback Pseudo-Interface 1", "Local Area Connection", "vEthernet (WSL)"]
+    fake = fake_psutil(nics, up=set(nics))
+    monitor = osc.NetworkMonitor()
+
+    fake.add("Local Area Connection", 50_000, 2_000_000)
+    fake.add("vEthernet (WSL)", 10, 10)
+    fake.add("Loopback Pseudo-Interface 1", 10_000_000, 10_000_000)
+    monitor.prev_time -= 1
+    *_, label = monitor.sample()
+
+    assert label == "Local Area Connection"
+
+
+def test_idle_auto_prefers_an_interface_that_is_up(osc, fake_psutil):
+    fake_psutil(["ifb0", "lo", "eth0"], up={"lo", "eth0"})
+    monitor = osc.NetworkMonitor()
+
+    monitor.prev_time -= 1
+    *_, label = monitor.sample()
+
+    assert label == "eth0"
+
+
+def test_named_interfaces_are_summed(osc, fake_psutil):
+    fake = fake_psutil(["eth0", "wlan0"], up={"eth0", "wlan0"})
+    monitor = osc.NetworkMonitor(["eth0", "wlan0"])
+
+    fake.add("eth0", 1000, 4000)
+    fake.add("wlan0", 1000, 4000)
+    monitor.prev_time -= 1
+    up, down, _, _, label = monitor.sample()
+
+    assert label == "eth0, wlan0"
+    assert up == pytest.approx(2000, rel=0.05)
+    assert down == pytest.approx(8000, rel=0.05)
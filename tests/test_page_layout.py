@@ -0,0 +1,66 @@
+def utf16_units(text):
+    return len(text.encode("utf-16-le")) // 2
+
+
+def media_context(osc, song, artist="Artist", page1="Page one"):
+    return {
+        "text": (page1, "Page two"),
+        "time": "09:41 PM",
+        "now": 0.0,
+        "network": (1024.0, 2048.0, 1024.0, 2048.0, "Ethernet"),
+        "media": (song, artist, osc.PlaybackClock(30000, 120000, False, 0.0)),
+    }
+
+
+def test_short_page_is_left_alone(osc):
+    page = osc.PageTemplate(osc.PAGES[0])
+    text = page.render(media_context(osc, "Song"))
+
+    assert text == "Page one\n09:41 PM\nDownload 2.0 KB/s\nUpload 1.0 KB/s\n" + "■■■" + "□" * 10 + "\n🎵 Song -Artist"
+
+
+def test_long_line_is_cut_to_the_line_budget(osc):
+    page = osc.PageTemplate(osc.PAGES[0])
+    text = page.render(media_context(osc, "A Very Long Song Title That Goes On And On And On", "Some Band"))
+    lines = text.split("\n")
+
+    assert max(utf16_units(line) for line in lines) <= osc.CHATBOX_LINE_CHARS
+    assert lines[-1].startswith("🎵 A Very Long")
+    assert lines[0] == "Page one"
+
+
+def test_emoji_count_as_two_units_against_the_page_limit(osc):
+    template = "\n".join(["🎵 {media.song}"] * 4)
+    page = osc.PageTemplate(template)
+    text = page.render(media_context(osc, "x" * 40))
+
+    assert len(text) <= osc.CHATBOX_MAX_CHARS
+    assert utf16_units(text) <= osc.CHATBOX_MAX_CHARS
+    assert utf16_units(text) > len(text)
+
+
+def test_truncate_never_splits_a_surrogate_pair(osc):
+    assert osc._truncate("ab🎵cd", 4) == "ab…"
+    assert osc._truncate("🎵🎵🎵", 5) == "🎵🎵…"
+    assert osc._cut_units("a🎵", 2) == "a"
+
+
+def test_repeat_layout_comes_from_the_cache(osc):
+    page = osc.PageTemplate(osc.PAGES[0])
+    long_song = "B" * 80
+    page.render(media_context(osc, long_song))
+    layouts = dict(page.layouts)
+    page.render(media_context(osc, "C" * 80))
+
+    assert page.layouts == layouts
+
+
+def test_bar_follows_the_style_set_at_runtime(osc, monkeypatch):
+    page = osc.PageTemplate("{media.bar}")
+    context = media_context(osc, "Song")
+    assert page.render(context) == "■■■" + "□" * 10
+
+    # A quarter of 13 cells is 3.25, the blocks style draws the quarter as a partial cell
+    monkeypatch.setattr(osc, "PROGRESS_STYLE", "blocks")
+    assert page.render(context) == "███▎" + "░" * 9
+    assert osc.create_progress_bar(30000, 120000) == "███▎" + "░" * 9
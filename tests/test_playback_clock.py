@@ -0,0 +1,31 @@
+from conftest import FakeMediaProvider, wait_for
+
+
+def test_playing_position_moves_with_the_clock(osc):
+    clock = osc.PlaybackClock(30000, 120000, True, 100.0)
+
+    assert clock.position(100.0) == 30000
+    assert clock.position(112.5) == 42500
+    assert clock.position(500.0) == 120000
+
+
+def test_paused_position_stays_put(osc):
+    clock = osc.PlaybackClock(30000, 120000, False, 100.0)
+
+    assert clock.position(160.0) == 30000
+
+
+def test_bar_advances_between_media_reads(osc):
+    snapshot = osc.SensorSnapshot(osc.SNAPSHOT_DEFAULTS)
+    provider = FakeMediaProvider(media=("Song (Official Video)", "Artist", 0, 130000, True))
+    monitor = osc.MediaMonitor(provider, osc.publish_media(snapshot), poll_interval=60)
+    monitor.start()
+    assert wait_for(lambda: snapshot.get("media")[0] == "Song")
+    monitor.stop()
+
+    song, artist, clock = snapshot.get("media")
+    bars = [osc.create_progress_bar(clock.position(clock.stamp + seconds), clock.duration_ms, style="classic")
+            for seconds in (0, 10, 60, 130)]
+
+    assert provider.reads == 1
+    assert bars == ["□" * 13, "■" + "□" * 12, "■■■■■■" + "□" * 7, "■" * 13]
@@ -0,0 +1,111 @@
+import time
+
+import pytest
+
+from conftest import FakeOSCClient
+
+
+class FakeStopEvent:
+    # Records how long the scheduler asked to sleep and returns straight away
+    def __init__(self):
+        self.delays = []
+
+    def wait(self, delay):
+        self.delays.append(delay)
+        return False
+
+
+@pytest.fixture
+def start():
+    # Buckets are stamped with time.monotonic() when they are made, keep the explicit
+    # now values ahead of that
+    return time.monotonic() + 1.0
+
+
+def test_bucket_allows_a_burst_then_one_per_interval(osc, start):
+    bucket = osc.TokenBucket(rate=1 / 2.0, capacity=3)
+
+    assert [bucket.take(start) for _ in range(4)] == [True, True, True, False]
+    assert bucket.ready_at(start) == pytest.approx(start + 2.0)
+    assert not bucket.take(start + 1.9)
+    assert bucket.take(start + 2.0)
+    assert not bucket.take(start + 2.0)
+
+
+def test_burst_of_submits_sends_burst_then_one_per_interval(osc, start):
+    client = FakeOSCClient()
+    sender = osc.ChatboxSender(client, min_interval=1.5, burst=2)
+
+    sent_at = []
+    for step in range(40):
+        now = start + step * 0.25
+        if sender.submit(f"text {step}", now=now):
+            sent_at.append(now - start)
+
+    assert sent_at[:2] == [0.0, 0.25]
+    assert [b - a for a, b in zip(sent_at[1:], sent_at[2:])] == pytest.approx([1.5] * (len(sent_at) - 2))
+    assert len(client.messages) == len(sent_at) == sender.sent
+
+
+def test_only_the_newest_pending_text_is_sent(osc, start):
+    client = FakeOSCClient()
+    sender = osc.ChatboxSender(client, min_interval=1.0, burst=1)
+
+    assert sender.submit("first", now=start)
+    assert not sender.submit("second", now=start + 0.2)
+    assert not sender.submit("third", now=start + 0.4)
+    assert sender.pending == "third"
+    assert sender.next_send_at(start + 0.4) == pytest.approx(start + 1.0)
+
+    assert sender.submit(sender.pending, now=start + 1.0)
+    assert [value[0] for _, value in client.messages] == ["first", "third"]
+    assert sender.pending is None
+    assert sender.deferred == 1
+
+
+def test_wait_wakes_early_for_pending_text(osc):
+    stop_event = FakeStopEvent()
+    scheduler = osc.SendScheduler(10.0, stop_event)
+    sender = osc.ChatboxSender(FakeOSCClient(), min_interval=1.0, burst=1)
+    now = time.monotonic()
+    sender.submit("first", now=now)
+    sender.submit("second", now=now)
+    scheduler.next_tick = now + 10.0
+
+    scheduler.wait(sender)
+
+    assert len(stop_event.delays) == 1
+    assert 0.5 < stop_event.delays[0] <= 1.0
+    # The tick was not due, it stays where it was
+    assert scheduler.next_tick == now + 10.0
+
+
+def test_wait_sleeps_to_the_tick_without_pending_text(osc):
+    stop_event = FakeStopEvent()
+    scheduler = osc.SendScheduler(10.0, stop_event)
+    sender = osc.ChatboxSender(FakeOSCClient())
+    tick = time.monotonic() + 5.0
+    scheduler.next_tick = tick
+
+    scheduler.wait(sender)
+
+    assert 4.5 < stop_event.delays[0] <= 5.0
+    assert scheduler.next_tick == tick + 10.0
+
+
+def test_drift_is_clamped(osc):
+    stop_event = FakeStopEvent()
+    scheduler = osc.SendScheduler(1.0, stop_event)
+
+    # Woke far too late: the correction is capped and the grid restarts from now
+    scheduler.next_tick = time.monotonic() - 5.0
+    scheduler.wait()
+    assert stop_event.delays == []
+    assert scheduler.drift == osc.SendScheduler.MAX_DRIFT
+    assert scheduler.next_tick > time.monotonic()
+
+    # Woke early (the fake event does not sleep): the correction never goes negative
+    for _ in range(5):
+        scheduler.next_tick = time.monotonic() + 1.0
+        scheduler.wait()
+    assert scheduler.drift == 0.0
@@ -0,0 +1,153 @@
+from types import SimpleNamespace
+
+
+def frame(index, interval_ms=11.1, reprojection=0, presents=1, dropped=0):
+    return SimpleNamespace(m_nFrameIndex=index, m_flSystemTimeInSeconds=index / 90,
+                           m_flClientFrameIntervalMs=interval_ms, m_nReprojectionFlags=reprojection,
+                           m_nNumFramePresents=presents, m_nNumDroppedFrames=dropped)
+
+
+class FakeCompositor:
+    # Frames are kept oldest first, frame_timings() returns the newest batch like OpenVR
+
+    def __init__(self):
+        self.presented = []
+        self.fail = None
+        self.quit = False
+        self.batches = 0
+
+    def quit_requested(self):
+        return self.quit
+
+    def frame_timings(self):
+        if self.fail:
+            raise self.fail
+        self.batches += 1
+        return self.presented[-90:]
+
+    def close(self):
+        pass
+
+
+class FakeSteamVR:
+    def __init__(self):
+        self.running = False
+        self.compositor = FakeCompositor()
+        self.opens = 0
+
+    def __call__(self):
+        self.opens += 1
+        if not self.running:
+            raise RuntimeError("VRInitError_Init_NoServerForBackgroundApp")
+        return self.compositor
+
+
+def test_stats_from_presented_frames(osc):
+    steamvr = FakeSteamVR()
+    steamvr.running = True
+    stats = osc.SteamVRFrameStats(steamvr)
+    steamvr.compositor.presented = [frame(i) for i in range(1, 90)] + [frame(90, 30.0, reprojection=0x01, dropped=2)]
+
+    fps, p50, p99, reprojected, dropped = stats.sample()
+
+    assert fps == 90
+    assert p50 == 11.1 and p99 == 30.0
+    assert reprojected == 1
+    assert dropped == 2
+
+
+def test_frames_already_seen_are_not_counted_twice(osc):
+    steamvr = FakeSteamVR()
+    steamvr.running = True
+    stats = osc.SteamVRFrameStats(steamvr)
+    steamvr.compositor.presented = [frame(i) for i in range(1, 11)]
+    stats.sample()
+    steamvr.compositor.presented += [frame(i) for i in range(11, 16)]
+    stats.sample()
+
+    assert [f[0] for f in stats.frames] == [i / 90 for i in range(1, 16)]
+
+
+def test_steamvr_not_running_is_logged_once_until_it_recovers(osc, capsys):
+    steamvr = FakeSteamVR()
+    stats = osc.SteamVRFrameStats(steamvr)
+
+    for _ in range(3):
+        stats.retry_at = 0.0
+        assert stats.sample() == ()
+    assert steamvr.opens == 3
+    assert capsys.readouterr().out.count("SteamVR not available") == 1
+
+    steamvr.running = True
+    steamvr.compositor.presented = [frame(1), frame(2)]
+    stats.retry_at = 0.0
+    assert stats.sample() != ()
+    assert "connected" in capsys.readouterr().out
+
+    # Lost again later: reported again, once
+    steamvr.running = False
+    steamvr.compositor.fail = RuntimeError("compositor went away")
+    assert stats.sample() == ()
+    for _ in range(3):
+        stats.retry_at = 0.0
+        stats.sample()
+    out = capsys.readouterr().out
+    assert out.count("SteamVR frame timing lost") == 1
+    assert out.count("SteamVR not available") == 1
+
+
+def test_missing_openvr_stops_retrying(osc, capsys):
+    def no_openvr():
+        raise ImportError("No module named 'openvr'")
+
+    stats = osc.SteamVRFrameStats(no_openvr)
+
+    assert stats.sample() == ()
+    assert stats.retry_at == float("inf")
+    assert "pip install openvr" in capsys.readouterr().out
+
+
+def test_frames_age_out_when_no_new_ones_arrive(osc):
+    steamvr = FakeSteamVR()
+    steamvr.running = True
+    stats = osc.SteamVRFrameStats(steamvr)
+    steamvr.compositor.presented = [frame(i) for i in range(1, 91)]
+    assert stats.sample() != ()
+
+    # SteamVR stops presenting without an error: still shown for a moment, then dropped
+    assert stats.sample() != ()
+    stats.clock_offset -= 3 * osc.STEAMVR_SAMPLE_INTERVAL
+
+    assert stats.sample() == ()
+    assert not stats.frames
+
+
+def test_quit_event_releases_the_handle(osc, capsys):
+    steamvr = FakeSteamVR()
+    steamvr.running = True
+    stats = osc.SteamVRFrameStats(steamvr)
+    steamvr.compositor.presented = [frame(1), frame(2)]
+    assert stats.sample() != ()
+
+    steamvr.compositor.quit = True
+    assert stats.sample() == ()
+    assert stats.compositor is None
+    assert "shutting down" in capsys.readouterr().out
+
+    steamvr.compositor.quit = False
+    stats.retry_at = 0.0
+    assert stats.sample() != ()
+    assert steamvr.opens == 2
+
+
+def test_each_sample_is_one_batched_read(osc):
+    steamvr = FakeSteamVR()
+    steamvr.running = True
+    stats = osc.SteamVRFrameStats(steamvr)
+    steamvr.compositor.presented = [frame(i) for i in range(1, 200)]
+
+    stats.sample()
+    stats.sample()
+
+    assert steamvr.compositor.batches == 2
+    assert len(stats.frames) == 90
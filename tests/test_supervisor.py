@@ -0,0 +1,98 @@
+import threading
+
+from conftest import wait_for
+
+
+class Loop:
+    # Stands in for run_osc_loop, records each run and waits on its stop event
+    def __init__(self, ignore_stop=None):
+        self.runs = 0
+        self.ignore_stop = ignore_stop
+
+    def __call__(self, stop_event):
+        self.runs += 1
+        if self.ignore_stop is not None:
+            self.ignore_stop.wait()
+        stop_event.wait()
+
+
+def test_start_and_stop(osc):
+    loop = Loop()
+    supervisor = osc.WorkerSupervisor(loop)
+
+    assert supervisor.start()
+    assert wait_for(lambda: supervisor.state == osc.WorkerState.RUNNING)
+    assert not supervisor.start()
+
+    supervisor.stop().join(1)
+    assert supervisor.state == osc.WorkerState.STOPPED
+    assert loop.runs == 1
+
+
+def test_stop_during_setup_never_runs_the_loop(osc):
+    loop = Loop()
+    supervisor = osc.WorkerSupervisor(loop)
+    in_setup = threading.Event()
+    finish_setup = threading.Event()
+
+    def setup():
+        in_setup.set()
+        finish_setup.wait()
+
+    supervisor.start(setup)
+    assert in_setup.wait(1)
+    thread = supervisor.stop()
+    finish_setup.set()
+    thread.join(1)
+
+    assert loop.runs == 0
+    assert supervisor.state == osc.WorkerState.STOPPED
+
+
+def test_restart_waits_for_a_slow_loop_to_exit(osc, monkeypatch):
+    monkeypatch.setattr(osc.WorkerSupervisor, "JOIN_TIMEOUT", 0.05)
+    release = threading.Event()
+    loop = Loop(ignore_stop=release)
+    supervisor = osc.WorkerSupervisor(loop)
+    supervisor.start()
+    assert wait_for(lambda: loop.runs == 1)
+
+    supervisor.restart()
+    threading.Event().wait(0.3)
+
+    # Past the join timeout the old loop is still running, so no second loop yet
+    assert loop.runs == 1
+    assert supervisor.state == osc.WorkerState.STOPPING
+    assert not supervisor.start()
+
+    release.set()
+    assert wait_for(lambda: loop.runs == 2 and supervisor.state == osc.WorkerState.RUNNING)
+    supervisor.stop().join(1)
+
+
+def test_restart_waits_for_the_old_samplers(osc, monkeypatch):
+    events = []
+
+    def slow_close():
+        threading.Event().wait(0.3)
+        events.append("closed")
+
+    def start_samplers(snapshot, stop_event, network_monitor):
+        events.append("started")
+        sampler = osc.Sampler("slow", 60, lambda: None, snapshot, stop_event, slow_close)
+        sampler.start()
+        return [sampler]
+
+    monkeypatch.setattr(osc, "start_samplers", start_samplers)
+    monkeypatch.setattr(osc, "detect_hardware_async", lambda on_done: None)
+    monkeypatch.setattr(osc, "media_provider_class", osc.NullMediaProvider)
+    monkeypatch.setattr(osc, "INTERFACE", "auto")
+    supervisor = osc.WorkerSupervisor(osc.run_osc_loop)
+
+    supervisor.start()
+    assert wait_for(lambda: events == ["started"])
+    supervisor.restart()
+    assert wait_for(lambda: len(events) == 3)
+    supervisor.stop().join(2)
+
+    assert events == ["started", "closed", "started", "closed"]
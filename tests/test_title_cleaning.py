@@ -0,0 +1,52 @@
+import pytest
+
+from conftest import fixture_path
+
+
+@pytest.fixture
+def title_rules(osc):
+    junk_words, cut_markers = list(osc.TITLE_JUNK_WORDS), list(osc.TITLE_CUT_MARKERS)
+    yield osc.configure_title_cleaning
+    osc.configure_title_cleaning(junk_words, cut_markers)
+
+
+def test_default_rules(osc):
+    assert osc.clean_title("Never Gonna Give You Up (Official Music Video)") == "Never Gonna Give You Up"
+    assert osc.clean_title("Get Lucky (feat. Pharrell Williams) - Radio Edit") == "Get Lucky"
+    assert osc.clean_title("SICKO MODE ft. Drake") == "SICKO MODE"
+    assert osc.clean_title("Believer Lyrics HD") == "Believer"
+    assert osc.clean_title("") == ""
+
+
+def test_empty_cut_markers_keep_the_title(osc, title_rules):
+    title_rules(cut_markers=[])
+
+    assert osc.clean_title("SICKO MODE ft. Drake") == "SICKO MODE ft. Drake"
+
+
+def test_empty_junk_words_keep_the_title(osc, title_rules):
+    title_rules(junk_words=[])
+
+    assert osc.clean_title("Believer Lyrics HD") == "Believer Lyrics HD"
+
+
+def test_both_lists_are_matched_literally(osc, title_rules):
+    title_rules(junk_words=["c++"], cut_markers=["prod."])
+
+    assert osc.clean_title("Production Line prod. Someone") == "Production Line"
+    assert osc.clean_title("c++ Song") == "Song"
+
+
+def test_reconfiguring_clears_the_cache(osc, title_rules):
+    assert osc.clean_title("Song Lyrics") == "Song"
+    title_rules(junk_words=["song"])
+
+    assert osc.clean_title("Song Lyrics") == "Lyrics"
+
+
+def test_corpus_titles_clean_to_something(osc):
+    with open(fixture_path("titles.txt"), encoding="utf-8") as f:
+        titles = [line.rstrip("\n") for line in f if line.strip() and not line.startswith("#")]
+
+    assert len(titles) > 50
+    assert all(osc.clean_title(title) for title in titles)
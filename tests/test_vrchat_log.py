@@ -0,0 +1,90 @@
+import os
+
+import pytest
+
+
+def log_line(text):
+    return f"2024.05.17 21:04:33 Log        -  {text}\n"
+
+
+@pytest.fixture
+def log_dir(tmp_path, osc, monkeypatch):
+    monkeypatch.setattr(osc, "VRCHAT_LOG_RESCAN", 0.0)
+    return tmp_path
+
+
+def write_log(path, text, mode="a", mtime=None):
+    with open(path, mode, encoding="utf-8", newline="") as f:
+        f.write(text)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+def test_tailer_reads_only_new_complete_lines(osc, log_dir):
+    path = log_dir / "output_log_2024-05-17_21-00-00.txt"
+    write_log(path, "first\r\nsecond\nthi")
+    tailer = osc.LogTailer(str(log_dir), osc.VRCHAT_LOG_GLOB)
+
+    assert tailer.read_lines() == ["first", "second"]
+    assert tailer.read_lines() == []
+    write_log(path, "rd\nfourth\n")
+    assert tailer.read_lines() == ["third", "fourth"]
+
+
+def test_tailer_starts_over_when_the_file_is_truncated(osc, log_dir):
+    path = log_dir / "output_log_2024-05-17_21-00-00.txt"
+    write_log(path, "old line one\nold line two\n")
+    tailer = osc.LogTailer(str(log_dir), osc.VRCHAT_LOG_GLOB)
+    tailer.read_lines()
+
+    write_log(path, "new\n", mode="w")
+
+    assert tailer.read_lines() == ["new"]
+
+
+def test_tailer_follows_a_newer_log(osc, log_dir):
+    write_log(log_dir / "output_log_2024-05-16_20-00-00.txt", "yesterday\n", mtime=1000)
+    tailer = osc.LogTailer(str(log_dir), osc.VRCHAT_LOG_GLOB)
+    assert tailer.read_lines() == ["yesterday"]
+
+    write_log(log_dir / "output_log_2024-05-17_21-00-00.txt", "today\n", mtime=2000)
+
+    assert tailer.read_lines() == ["today"]
+
+
+def test_tailer_reads_a_long_log_in_chunks(osc, log_dir, monkeypatch):
+    monkeypatch.setattr(osc, "VRCHAT_LOG_CHUNK", 16)
+    write_log(log_dir / "output_log_2024-05-17_21-00-00.txt", "".join(f"line {i}\n" for i in range(10)))
+    tailer = osc.LogTailer(str(log_dir), osc.VRCHAT_LOG_GLOB)
+
+    lines = []
+    while not tailer.caught_up:
+        lines += tailer.read_lines()
+
+    assert lines == [f"line {i}" for i in range(10)]
+
+
+def test_monitor_tracks_world_and_players(osc, log_dir):
+    path = log_dir / "output_log_2024-05-17_21-00-00.txt"
+    write_log(path, "".join(map(log_line, [
+        "[Behaviour] Joining wrld_4cf554b4-430c-4f8f-b53e-1f294eb230dd:12345~private(usr_1)~region(eu)",
+        "[Behaviour] Entering Room: The Black Cat",
+        "[Behaviour] OnPlayerJoined Alice (usr_0a1b2c3d-0000-4000-8000-000000000001)",
+        "[Behaviour] OnPlayerJoined Bob",
+    ])))
+    monitor = osc.VRChatLogMonitor(osc.LogTailer(str(log_dir), osc.VRCHAT_LOG_GLOB))
+
+    # Catching up on what was already in the log is not announced
+    assert monitor.sample() == ("The Black Cat", "12345", 2, "")
+
+    write_log(path, log_line("[Behaviour] OnPlayerLeft Bob"))
+    assert monitor.sample() == ("The Black Cat", "12345", 1, "- Bob")
+
+    write_log(path, log_line("[Behaviour] OnLeftRoom"))
+    assert monitor.sample()[:3] == ("", "", 0)
+
+
+def test_monitor_without_a_log_folder(osc, tmp_path):
+    monitor = osc.VRChatLogMonitor(osc.LogTailer(str(tmp_path / "missing"), osc.VRCHAT_LOG_GLOB))
+
+    assert monitor.sample() == ("", "", 0, "")